@@ -0,0 +1,84 @@
+import os
+import hmac
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.services import intent_cache, memory, profiling, response_cache, runtime_config, templates
+
+MAX_PROFILE_SECONDS = 120
+
+def require_admin(x_admin_token: str = Header(default="")):
+    # ADMIN_TOKEN 이 없으면 관리자 API 전체를 막음 (서버가 0.0.0.0 으로 열려 있어도 안전하도록)
+    admin_token = os.getenv("ADMIN_TOKEN", "")
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="admin api disabled")
+    if not hmac.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=403, detail="forbidden")
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.post("/profile")
+def start_profile(seconds: float = 10):
+    seconds = min(max(seconds, 0.1), MAX_PROFILE_SECONDS)
+    if not profiling.profiler.start(seconds):
+        raise HTTPException(status_code=409, detail="profiler already running")
+    return profiling.profiler.status()
+
+@router.delete("/profile")
+def stop_profile():
+    profiling.profiler.stop()
+    return profiling.profiler.status()
+
+@router.get("/profile")
+def read_profile_status():
+    return profiling.profiler.status()
+
+@router.get("/profile/collapsed", response_class=PlainTextResponse)
+def download_profile():
+    # flamegraph.pl 또는 https://www.speedscope.app 에 그대로 넣을 수 있는 collapsed stack
+    return profiling.profiler.collapsed()
+
+@router.get("/traces/slow")
+def read_slow_traces():
+    return list(profiling.recent_slow_traces)
+
+@router.get("/memory")
+def read_memory(limit: int = 20):
+    # MEMORY_TRACKING=true 일 때 할당 상위 위치, 캐시 등 프로세스 내 구조의 사용량
+    return {
+        "tracking": memory.tracking(),
+        "traced_bytes": memory.allocated(),
+        "intent_cache_bytes": intent_cache.cache.memory_used,
+        "intent_cache_entries": len(intent_cache.cache._memory),
+        "intent_cache_write_queue": intent_cache.cache._writes.qsize(),
+        "intent_cache_dropped_writes": intent_cache.cache.dropped_writes,
+        "top_allocations": memory.top_allocations(limit),
+    }
+
+
+@router.get("/config")
+def read_config():
+    return runtime_config.current().to_dict()
+
+@router.post("/config/reload")
+def reload_config():
+    # 감시 주기를 기다리지 않고 바로 다시 읽음 (파일이 깨져 있으면 이전 설정 유지)
+    changed = runtime_config.store.reload(force=True)
+    return {"changed": changed, **runtime_config.current().to_dict()}
+
+@router.get("/templates")
+def read_templates():
+    # (인텐트|page) → 템플릿 버전
+    return templates.store.entries()
+
+@router.delete("/templates")
+def purge_templates():
+    return {"purged": templates.store.purge()}
+
+@router.get("/backend-cache")
+def read_backend_cache():
+    return response_cache.cache.stats()
+
+@router.delete("/backend-cache")
+def purge_backend_cache():
+    # 백엔드 메뉴 응답이 바뀐 경우 (메뉴 파일 변경은 자동으로 비움)
+    return {"purged": response_cache.cache.purge()}
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Request
-from app.services import openai_client
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
+from app.services import openai_client, metrics, scheduler
+from app.services.voice_stream import VoiceStreamSession
 
 router = APIRouter()
 
@@ -9,5 +10,31 @@ async def process_command(request: Request):
     text = body.get("text", "")
     session_id = body.get("sessionId", "")
     page = body.get("page", "")
-    result = await openai_client.handle_text(text, session_id, page)
+    tenant = scheduler.tenant_for(session_id, request.headers.get(scheduler.TENANT_HEADER))
+    result = await openai_client.handle_text(text, session_id, page, tenant)
     return {"response": result}
+
+@router.websocket("/stream/{session_id}")
+async def stream_command(websocket: WebSocket, session_id: str):
+    # {"type": "partial" | "final", "text": ..., "page": ...} 메시지를 연속으로 받음
+    await websocket.accept()
+    tenant = scheduler.tenant_for(session_id, websocket.headers.get(scheduler.TENANT_HEADER))
+
+    async def extract(text: str, page: str):
+        return await openai_client.extract_intent(text, page, tenant)
+
+    session = VoiceStreamSession(session_id, extract, openai_client.dispatch_intent)
+    try:
+        while True:
+            message = await websocket.receive_json()
+            result = await session.handle(message)
+            if result is not None:
+                await websocket.send_json({"response": result})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        session.close()
+
+@router.get("/metrics")
+def read_metrics():
+    return metrics.snapshot()
@@ -1,10 +1,14 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-from app.api import nlp
+from app.api import nlp, admin
+from app.services import intent_cache, memory, profiling, runtime_config, usage
+from app.services.loop_monitor import monitor as loop_monitor
+from app.services.dispatcher import dispatcher
 
 app = FastAPI()
 app.include_router(nlp.router, prefix="/voice")
+app.include_router(admin.router, prefix="/admin")
 
 origins = [
     "http://localhost:3000",  
@@ -19,6 +23,34 @@ app.add_middleware(
     allow_headers=["*"],  
 )
 
+async def trace_requests(request: Request, call_next):
+    with profiling.trace_request(request.url.path, method=request.method):
+        return await call_next(request)
+
+# 요청 트레이스 미들웨어는 계측이 켜져 있을 때만 등록 (꺼져 있으면 요청마다 미들웨어를 거치지 않음)
+if profiling.PROFILING_ENABLED or memory.MEMORY_TRACKING:
+    app.middleware("http")(trace_requests)
+
+@app.on_event("startup")
+async def start_monitors():
+    memory.start()
+    loop_monitor.start()
+    runtime_config.store.start()
+
+@app.on_event("startup")
+def warm_intent_cache():
+    if intent_cache.CACHE_ENABLED:
+        loaded = intent_cache.cache.warm_up()
+        print("[인텐트 캐시 warm load]", loaded)
+
+@app.on_event("shutdown")
+async def close_services():
+    await loop_monitor.stop()
+    await runtime_config.store.stop()
+    await dispatcher.close()
+    intent_cache.cache.close()
+    usage.tracker.close()
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Say it, it's Okay!"}
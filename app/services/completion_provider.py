@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.services.usage import usage_tokens
+
+# 모델 호출(chat completion) 제공자
+# - live  : OpenAI API 호출 (기본)
+# - record: OpenAI API 를 호출하면서 요청 fingerprint 별 응답/토큰/지연을 COMPLETION_FIXTURE_DIR 에 저장
+# - replay: 저장된 응답만 사용 (네트워크 없음). 지연은 COMPLETION_REPLAY_LATENCY 로 재현
+#           ("0": 즉시, "original": 녹화 당시 지연, 숫자: 고정 지연(초))
+COMPLETION_MODE = os.getenv("COMPLETION_MODE", "live")
+FIXTURE_DIR = os.getenv(
+    "COMPLETION_FIXTURE_DIR",
+    str(Path(__file__).resolve().parents[2] / ".cache" / "completions"),
+)
+REPLAY_LATENCY = os.getenv("COMPLETION_REPLAY_LATENCY", "0")
+
+
+def request_fingerprint(model: str, messages: List[Dict[str, str]], temperature: float) -> str:
+    body = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature},
+        ensure_ascii=False, sort_keys=True,
+    )
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()[:24]
+
+
+class OpenAIProvider:
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        # replay 모드에서는 API 키 없이도 동작하도록 실제 클라이언트는 처음 쓸 때 생성
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._client
+
+    async def complete(self, model: str, messages: List[Dict[str, str]], temperature: float) -> Dict:
+        response = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature
+        )
+        return {
+            "content": response.choices[0].message.content,
+            "usage": usage_tokens(response.usage),
+        }
+
+
+class FixtureStore:
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def path(self, fingerprint: str) -> Path:
+        return self.directory / f"{fingerprint}.json"
+
+    def load(self, fingerprint: str) -> Optional[Dict]:
+        path = self.path(fingerprint)
+        if not path.exists():
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, fingerprint: str, fixture: Dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # 같은 요청을 동시에 녹화해도 깨진 파일이 남지 않도록 임시 파일 후 교체
+        tmp = self.path(fingerprint).with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(fixture, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path(fingerprint))
+
+
+class RecordingProvider:
+    def __init__(self, inner, store: FixtureStore):
+        self.inner = inner
+        self.store = store
+
+    async def complete(self, model: str, messages: List[Dict[str, str]], temperature: float) -> Dict:
+        started = time.perf_counter()
+        completion = await self.inner.complete(model, messages, temperature)
+        latency = time.perf_counter() - started
+        self.store.save(request_fingerprint(model, messages, temperature), {
+            "model": model,
+            "user": messages[-1]["content"] if messages else "",
+            "latency": round(latency, 4),
+            **completion,
+        })
+        return completion
+
+
+class ReplayProvider:
+    def __init__(self, store: FixtureStore, latency: str = "0"):
+        self.store = store
+        self.latency = latency
+
+    async def complete(self, model: str, messages: List[Dict[str, str]], temperature: float) -> Dict:
+        fingerprint = request_fingerprint(model, messages, temperature)
+        fixture = self.store.load(fingerprint)
+        if fixture is None:
+            user = messages[-1]["content"] if messages else ""
+            raise LookupError(f"녹화된 응답 없음: {fingerprint} ({user})")
+
+        delay = fixture.get("latency", 0) if self.latency == "original" else float(self.latency)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return {"content": fixture["content"], "usage": fixture.get("usage")}
+
+
+def create_provider(mode: str = COMPLETION_MODE, fixture_dir: str = FIXTURE_DIR):
+    if mode == "replay":
+        return ReplayProvider(FixtureStore(fixture_dir), REPLAY_LATENCY)
+    if mode == "record":
+        return RecordingProvider(OpenAIProvider(), FixtureStore(fixture_dir))
+    return OpenAIProvider()
+
+
+provider = create_provider()
+
+
+def set_provider(new_provider):
+    # 벤치마크/테스트에서 다른 제공자로 교체할 때 사용
+    global provider
+    provider = new_provider
@@ -0,0 +1,188 @@
+import os
+import time
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from app.services import memory, metrics, response_cache
+
+# 백엔드 전달 방식
+# - sync : 요청마다 바로 POST 하고 응답을 기다림 (기본)
+# - batch: BATCH_WINDOW 동안 모인 여러 세션의 payload 를 BACKEND_BATCH_URL 로 한 번에 POST
+#          (백엔드는 요청 배열을 받아 같은 순서의 응답 배열을 돌려줘야 함)
+# - async: BACKEND_ASYNC_REQUESTS 에 포함된 request 종류는 큐에 넣고 바로 accepted 응답,
+#          백그라운드 워커가 재시도하며 전달
+# 메뉴 보기처럼 세션과 무관한 요청은 방식과 상관없이 응답 캐시(response_cache)를 먼저 확인
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:3000/api/handle")
+BACKEND_BATCH_URL = os.getenv("BACKEND_BATCH_URL", "")
+DISPATCH_MODE = os.getenv("BACKEND_DISPATCH_MODE", "sync")
+ASYNC_REQUESTS = {key for key in os.getenv("BACKEND_ASYNC_REQUESTS", "").split(",") if key}
+
+BATCH_WINDOW = float(os.getenv("BACKEND_BATCH_WINDOW", 0.01))
+BATCH_MAX_SIZE = int(os.getenv("BACKEND_BATCH_MAX_SIZE", 32))
+QUEUE_MAX_SIZE = int(os.getenv("BACKEND_QUEUE_MAX_SIZE", 1000))
+QUEUE_MAX_BYTES = int(os.getenv("BACKEND_QUEUE_MAX_BYTES", 8 * 1024 * 1024))
+QUEUE_WORKERS = int(os.getenv("BACKEND_QUEUE_WORKERS", 2))
+MAX_RETRIES = int(os.getenv("BACKEND_MAX_RETRIES", 3))
+RETRY_BACKOFF = float(os.getenv("BACKEND_RETRY_BACKOFF", 0.2))
+REQUEST_TIMEOUT = float(os.getenv("BACKEND_TIMEOUT", 10))
+
+
+class BackendDispatcher:
+    def __init__(self):
+        self._client = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._queue_bytes = 0
+        self._workers: List[asyncio.Task] = []
+        self._batch: List[Tuple[Dict, asyncio.Future]] = []
+        self._batch_task: Optional[asyncio.Task] = None
+
+    @property
+    def client(self):
+        # 요청마다 새 클라이언트를 만들지 않고 커넥션 풀을 재사용 (테스트에서는 _client 를 바꿔 끼움)
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(timeout=REQUEST_TIMEOUT)
+        return self._client
+
+    def mode_for(self, data: Dict) -> str:
+        if data.get("request") in ASYNC_REQUESTS:
+            return "async"
+        if DISPATCH_MODE == "batch" and BACKEND_BATCH_URL:
+            return "batch"
+        return "sync"
+
+    async def dispatch(self, data: Dict, menu_version: str = ""):
+        key = response_cache.cache_key(data) if response_cache.RESPONSE_CACHE_ENABLED else None
+        if key is not None:
+            cached = response_cache.cache.get(key, menu_version)
+            if cached is not None:
+                return cached
+        response = await self._dispatch(data)
+        if key is not None:
+            response_cache.cache.put(key, response, menu_version)
+        return response
+
+    async def _dispatch(self, data: Dict):
+        mode = self.mode_for(data)
+        if mode == "async":
+            return self._enqueue(data)
+        if mode == "batch":
+            return await self._dispatch_batched(data)
+        return await self._post(data, mode)
+
+    def deliver_later(self, data: Dict) -> Dict:
+        # 응답을 이미 정한 요청(템플릿 응답 등)을 백그라운드 큐로만 전달
+        return self._enqueue(data)
+
+    async def _post(self, data: Dict, mode: str = "sync"):
+        started = time.perf_counter()
+        try:
+            response = await self.client.post(BACKEND_URL, json=data)
+            if mode != "sync":
+                # sync 는 기존처럼 백엔드 오류 본문을 그대로 돌려주고, 큐 전달은 5xx 를 재시도하도록 예외로
+                response.raise_for_status()
+            return response.json()
+        finally:
+            metrics.observe("backend_delivery_seconds", time.perf_counter() - started, mode=mode)
+
+    # --- acknowledged-async ---
+
+    def _enqueue(self, data: Dict) -> Dict:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=QUEUE_MAX_SIZE)
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(QUEUE_WORKERS)]
+        size = memory.sizeof(data)
+        if self._queue.full() or self._queue_bytes + size > QUEUE_MAX_BYTES:
+            metrics.inc("backend_queue_rejected")
+            return {"status": "rejected", "reason": "queue_full"}
+        self._queue.put_nowait((data, time.perf_counter(), size))
+        self._queue_bytes += size
+        metrics.set_gauge("backend_queue_depth", self._queue.qsize())
+        metrics.set_gauge("backend_queue_bytes", self._queue_bytes)
+        return {"status": "accepted"}
+
+    async def _worker(self):
+        while True:
+            data, enqueued_at, size = await self._queue.get()
+            try:
+                for attempt in range(MAX_RETRIES + 1):
+                    try:
+                        await self._post(data, "async")
+                        break
+                    except Exception as e:
+                        # 4xx 는 다시 보내도 같은 결과이므로 재시도하지 않음
+                        status = getattr(getattr(e, "response", None), "status_code", 0)
+                        if attempt == MAX_RETRIES or 400 <= status < 500:
+                            metrics.inc("backend_queue_dropped")
+                            print("[백엔드 전달 실패]", data.get("request"), e)
+                            break
+                        else:
+                            metrics.inc("backend_queue_retries")
+                            await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+                metrics.observe("backend_queue_seconds", time.perf_counter() - enqueued_at)
+            finally:
+                self._queue_bytes -= size
+                self._queue.task_done()
+                metrics.set_gauge("backend_queue_depth", self._queue.qsize())
+                metrics.set_gauge("backend_queue_bytes", self._queue_bytes)
+
+    # --- micro-batch ---
+
+    async def _dispatch_batched(self, data: Dict):
+        future = asyncio.get_running_loop().create_future()
+        self._batch.append((data, future))
+        metrics.set_gauge("backend_batch_pending", len(self._batch))
+        if len(self._batch) >= BATCH_MAX_SIZE:
+            self._flush_batch()
+        elif self._batch_task is None:
+            self._batch_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(BATCH_WINDOW)
+        self._batch_task = None
+        self._flush_batch()
+
+    def _flush_batch(self):
+        batch, self._batch = self._batch, []
+        metrics.set_gauge("backend_batch_pending", 0)
+        if batch:
+            asyncio.create_task(self._send_batch(batch))
+
+    async def _send_batch(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        started = time.perf_counter()
+        metrics.inc("backend_batches")
+        metrics.inc("backend_batched_requests", len(batch))
+        try:
+            response = await self.client.post(BACKEND_BATCH_URL, json=[data for data, _ in batch])
+            response.raise_for_status()
+            results = response.json()
+            # 응답 배열이 요청과 맞지 않으면 하나도 넘기지 않음 (순서가 어긋난 응답을 다른 세션에 주지 않도록)
+            if not isinstance(results, list) or len(results) != len(batch):
+                size = len(results) if isinstance(results, list) else type(results).__name__
+                raise ValueError(f"batch response size {size} != {len(batch)}")
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            metrics.observe("backend_delivery_seconds", time.perf_counter() - started, mode="batch")
+
+    async def close(self):
+        # 종료 시 큐에 남은 전달을 마저 처리
+        if self._queue is not None:
+            await self._queue.join()
+            for worker in self._workers:
+                worker.cancel()
+        if self._batch:
+            batch, self._batch = self._batch, []
+            await self._send_batch(batch)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+dispatcher = BackendDispatcher()
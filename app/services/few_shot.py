@@ -0,0 +1,92 @@
+import json
+import math
+import heapq
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from app.services import metrics, normalize, usage
+from app.services.runtime_config import ConfigSnapshot
+
+# 적응형 few-shot 프롬프트
+# 전체 시스템 프롬프트(예시 수십 개 포함) 대신, 규칙만 남긴 core 프롬프트에
+# 예시 저장소(config/examples.jsonl)에서 현재 발화와 가장 비슷한 예시 몇 개만 골라 붙인다.
+# - 유사도: 정규화한 발화의 글자 bigram TF-IDF 코사인 (역색인으로 겹치는 bigram 이 있는 예시만 채점)
+# - 예시는 user/assistant 대화 쌍으로 붙이고, 가장 비슷한 예시를 현재 발화 바로 앞에 둠
+# - settings.json 의 prompt_mode 가 "adaptive" 이거나, 일일 토큰 예산을 넘은 경우(OPENAI_BUDGET_PROMPT_MODE) 사용
+NGRAM = 2
+
+
+def _grams(text: str) -> Counter:
+    # 단어 경계도 특징이 되도록 앞뒤에 공백을 붙여서 자름
+    text = f" {normalize.normalize(text)} "
+    return Counter(text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1))
+
+
+class ExampleIndex:
+    def __init__(self, examples: List[Dict]):
+        self.examples = examples
+        self.texts = [normalize.normalize(example["text"]) for example in examples]
+        # 예시 정답은 한 번만 직렬화해 두고 재사용
+        self.outputs = [json.dumps(example["output"], ensure_ascii=False) for example in examples]
+
+        grams = [_grams(text) for text in self.texts]
+        document_frequency = Counter(gram for counts in grams for gram in counts)
+        total = len(examples)
+        self.idf = {gram: math.log((total + 1) / (count + 1)) + 1 for gram, count in document_frequency.items()}
+        self.postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        self.norms: List[float] = []
+        for index, counts in enumerate(grams):
+            weights = {gram: count * self.idf[gram] for gram, count in counts.items()}
+            self.norms.append(math.sqrt(sum(w * w for w in weights.values())) or 1.0)
+            for gram, weight in weights.items():
+                self.postings[gram].append((index, weight))
+
+    def search(self, text: str, k: int, exclude: Optional[str] = None) -> List[Tuple[float, int]]:
+        # exclude: 같은 발화의 예시는 제외 (평가 시 정답이 예시로 들어가는 것을 막음)
+        skip = normalize.normalize(exclude) if exclude is not None else None
+        scores: Dict[int, float] = defaultdict(float)
+        query = {gram: count * self.idf.get(gram, 0.0) for gram, count in _grams(text).items()}
+        for gram, weight in query.items():
+            if not weight:
+                continue
+            for index, example_weight in self.postings.get(gram, ()):
+                scores[index] += weight * example_weight
+        candidates = (
+            (score / self.norms[index], index) for index, score in scores.items() if self.texts[index] != skip
+        )
+        return heapq.nlargest(k, candidates)
+
+    def messages(self, text: str, k: int, exclude: Optional[str] = None) -> List[Dict[str, str]]:
+        messages = []
+        for _, index in reversed(self.search(text, k, exclude)):
+            messages.append({"role": "user", "content": self.texts[index]})
+            messages.append({"role": "assistant", "content": self.outputs[index]})
+        return messages
+
+
+_index: Optional[ExampleIndex] = None
+_index_version: Optional[str] = None
+
+
+def get_index(config: ConfigSnapshot) -> ExampleIndex:
+    # 예시 파일이 바뀌었을 때만 다시 만듦
+    global _index, _index_version
+    if config.examples_version != _index_version:
+        _index = ExampleIndex(config.examples)
+        _index_version = config.examples_version
+    return _index
+
+
+def choose_mode(config: ConfigSnapshot) -> str:
+    mode = config.prompt_mode
+    if mode != "adaptive" and usage.BUDGET_PROMPT_MODE == "adaptive" and usage.tracker.over_budget():
+        metrics.inc("prompt_budget_trimmed")
+        mode = "adaptive"
+    if mode == "adaptive" and not config.adaptive_available:
+        return "full"
+    return mode
+
+
+def make_messages(user_input: str, config: ConfigSnapshot, exclude: Optional[str] = None) -> List[Dict[str, str]]:
+    examples = get_index(config).messages(user_input, config.fewshot_k, exclude)
+    return [config.core_message, *examples, {"role": "user", "content": user_input}]
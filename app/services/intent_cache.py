@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import queue
+import asyncio
+import sqlite3
+import hashlib
+import threading
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.services.shared_cache import SharedTable
+
+# 인텐트 추출 결과를 재시작 이후에도 유지하는 디스크 캐시 (SQLite)
+# - 키: 정규화된 발화 + 프롬프트/모델 fingerprint
+# - 쓰기는 백그라운드 스레드에서 모아서 처리 (write-behind)
+#   대기열은 INTENT_CACHE_WRITE_QUEUE_MAX 개까지 (SQLite 가 느리거나 잠겨도 메모리가 늘지 않도록 넘치면 버림,
+#   결과는 이미 메모리/공유 계층에 있으므로 디스크 계층에만 늦게/덜 반영됨)
+# - 디스크 엔트리 수 상한 초과 시 last_used 기준 LRU 삭제 (개수 확인은 INTENT_CACHE_TRIM_INTERVAL 마다, 종료 시 한 번 더)
+# - 시작 시 hits 가 높은 엔트리를 메모리로 미리 적재 (warm load)
+# - INTENT_CACHE_SHARED=true 이면 프로세스 메모리와 디스크 사이에 워커 간 공유 메모리 계층을 둠
+#   (조회 순서: 프로세스 메모리 → 공유 메모리 → SQLite)
+CACHE_ENABLED = os.getenv("INTENT_CACHE_ENABLED", "true").lower() != "false"
+CACHE_PATH = os.getenv(
+    "INTENT_CACHE_PATH",
+    str(Path(__file__).resolve().parents[2] / ".cache" / "intent_cache.sqlite3"),
+)
+CACHE_MAX_ENTRIES = int(os.getenv("INTENT_CACHE_MAX_ENTRIES", 50000))
+CACHE_MEMORY_ENTRIES = int(os.getenv("INTENT_CACHE_MEMORY_ENTRIES", 2000))
+CACHE_MEMORY_BYTES = int(os.getenv("INTENT_CACHE_MEMORY_BYTES", 16 * 1024 * 1024))
+CACHE_FLUSH_INTERVAL = float(os.getenv("INTENT_CACHE_FLUSH_INTERVAL", 0.5))
+CACHE_WRITE_QUEUE_MAX = int(os.getenv("INTENT_CACHE_WRITE_QUEUE_MAX", 10000))
+CACHE_TRIM_INTERVAL = float(os.getenv("INTENT_CACHE_TRIM_INTERVAL", 30))
+CACHE_SHARED = os.getenv("INTENT_CACHE_SHARED", "false").lower() == "true"
+CACHE_SHARED_PATH = os.getenv(
+    "INTENT_CACHE_SHARED_PATH",
+    "/dev/shm/nlp_intent_cache" if os.path.isdir("/dev/shm")
+    else str(Path(__file__).resolve().parents[2] / ".cache" / "intent_cache.shm"),
+)
+CACHE_SHARED_SLOTS = int(os.getenv("INTENT_CACHE_SHARED_SLOTS", 16384))
+CACHE_SHARED_SLOT_BYTES = int(os.getenv("INTENT_CACHE_SHARED_SLOT_BYTES", 2048))
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def fingerprint(*parts) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()[:16]
+
+
+def make_key(text: str, prompt_fingerprint: str) -> str:
+    return fingerprint(normalize_text(text), prompt_fingerprint)
+
+
+class IntentCache:
+    def __init__(self, path: str, max_entries: int, memory_entries: int,
+                 flush_interval: float = CACHE_FLUSH_INTERVAL, memory_bytes: int = CACHE_MEMORY_BYTES,
+                 shared: Optional[SharedTable] = None, write_queue_max: int = CACHE_WRITE_QUEUE_MAX,
+                 trim_interval: float = CACHE_TRIM_INTERVAL):
+        self.path = path
+        self.shared = shared
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.memory_bytes = memory_bytes
+        self.memory_used = 0
+        self.flush_interval = flush_interval
+        self.trim_interval = trim_interval
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.dropped_writes = 0
+        self._last_trim = 0.0
+
+        # 메모리 계층: key -> 직렬화된 JSON 문자열 (꺼낼 때마다 새 dict 로 복원)
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        # 읽기/쓰기 커넥션을 분리해 (WAL) 쓰기 배치가 커밋되는 동안에도 조회가 막히지 않게 함
+        self._read_lock = threading.Lock()
+        self._read_conn: Optional[sqlite3.Connection] = None
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._writes: "queue.Queue" = queue.Queue(maxsize=write_queue_max)
+        self._writer: Optional[threading.Thread] = None
+
+    def _open(self) -> sqlite3.Connection:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS intent_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "hits INTEGER NOT NULL DEFAULT 0, last_used REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS intent_cache_last_used ON intent_cache(last_used)"
+        )
+        conn.commit()
+        return conn
+
+    def _read(self, sql: str, params=()):
+        with self._read_lock:
+            if self._read_conn is None:
+                self._read_conn = self._open()
+            return self._read_conn.execute(sql, params).fetchall()
+
+    def _remember(self, key: str, value: str):
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self.memory_used -= sys.getsizeof(key) + sys.getsizeof(previous)
+        self._memory[key] = value
+        self.memory_used += sys.getsizeof(key) + sys.getsizeof(value)
+        # 엔트리 수와 바이트 둘 다 상한을 넘지 않도록 오래된 것부터 제거
+        while self._memory and (len(self._memory) > self.memory_entries or self.memory_used > self.memory_bytes):
+            old_key, old_value = self._memory.popitem(last=False)
+            self.memory_used -= sys.getsizeof(old_key) + sys.getsizeof(old_value)
+
+    def _memory_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+            return value
+
+    def _shared_get(self, key: str) -> Optional[str]:
+        if self.shared is None:
+            return None
+        value = self.shared.get(key)
+        if value is not None:
+            self.shared_hits += 1
+            with self._lock:
+                self._remember(key, value)
+        return value
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        rows = self._read("SELECT value FROM intent_cache WHERE key = ?", (key,))
+        if not rows:
+            return None
+        with self._lock:
+            self._remember(key, rows[0][0])
+        if self.shared is not None:
+            self.shared.put(key, rows[0][0])
+        return rows[0][0]
+
+    def _found(self, key: str, value: Optional[str]) -> Optional[Dict]:
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._enqueue(("touch", key, None, time.time()))
+        return json.loads(value)
+
+    def get(self, key: str) -> Optional[Dict]:
+        value = self._memory_get(key) or self._shared_get(key)
+        if value is None:
+            value = self._disk_get(key)
+        return self._found(key, value)
+
+    async def aget(self, key: str) -> Optional[Dict]:
+        # 메모리 계층에서 못 찾으면 디스크 조회는 스레드에서 (이벤트 루프를 막지 않도록)
+        # 공유 메모리 조회는 mmap 읽기뿐이라 루프에서 바로
+        value = self._memory_get(key) or self._shared_get(key)
+        if value is None:
+            value = await asyncio.to_thread(self._disk_get, key)
+        return self._found(key, value)
+
+    def put(self, key: str, result: Dict):
+        value = json.dumps(result, ensure_ascii=False)
+        with self._lock:
+            self._remember(key, value)
+        if self.shared is not None:
+            self.shared.put(key, value)
+        self._enqueue(("put", key, value, time.time()))
+
+    def warm_up(self, limit: Optional[int] = None) -> int:
+        limit = self.memory_entries if limit is None else limit
+        rows = self._read(
+            "SELECT key, value FROM intent_cache ORDER BY hits DESC, last_used DESC LIMIT ?",
+            (limit,),
+        )
+        with self._lock:
+            # 가장 많이 쓰인 항목이 LRU 의 뒤쪽(최근)에 오도록 역순으로 적재
+            for key, value in reversed(rows):
+                self._remember(key, value)
+        return len(rows)
+
+    def _enqueue(self, op):
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+        try:
+            self._writes.put_nowait(op)
+        except queue.Full:
+            # 루프를 막지 않도록 기다리지 않고 버림 (touch 는 hits/last_used 통계만, put 은 디스크 계층만 놓침)
+            self.dropped_writes += 1
+
+    def _write_loop(self):
+        while True:
+            op = self._writes.get()
+            batch = [op]
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._writes.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                self._apply(batch)
+            except sqlite3.Error as e:
+                print("[인텐트 캐시 쓰기 실패]", e)
+            finally:
+                for _ in batch:
+                    self._writes.task_done()
+
+    def _apply(self, batch):
+        if self._write_conn is None:
+            self._write_conn = self._open()
+        conn = self._write_conn
+        for kind, key, value, used_at in batch:
+            if kind == "put":
+                conn.execute(
+                    "INSERT INTO intent_cache (key, value, hits, last_used) VALUES (?, ?, 0, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, last_used = excluded.last_used",
+                    (key, value, used_at),
+                )
+            elif kind == "touch":
+                conn.execute(
+                    "UPDATE intent_cache SET hits = hits + 1, last_used = ? WHERE key = ?",
+                    (used_at, key),
+                )
+        # 전체 개수 확인은 배치마다 하지 않고 trim_interval 마다 (그 사이 상한을 조금 넘을 수 있음)
+        if time.monotonic() - self._last_trim >= self.trim_interval:
+            self._trim(conn)
+        conn.commit()
+
+    def _trim(self, conn: sqlite3.Connection):
+        self._last_trim = time.monotonic()
+        overflow = conn.execute("SELECT COUNT(*) FROM intent_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM intent_cache WHERE key IN "
+                "(SELECT key FROM intent_cache ORDER BY last_used ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def flush(self):
+        # 대기 중인 쓰기가 모두 디스크에 반영될 때까지 기다림
+        if self._writer is not None and self._writer.is_alive():
+            self._writes.join()
+
+    def close(self):
+        self.flush()
+        with self._read_lock:
+            if self._read_conn is not None:
+                self._read_conn.close()
+                self._read_conn = None
+        if self._write_conn is not None:
+            try:
+                self._trim(self._write_conn)
+                self._write_conn.commit()
+            except sqlite3.Error as e:
+                print("[인텐트 캐시 쓰기 실패]", e)
+            self._write_conn.close()
+            self._write_conn = None
+        if self.shared is not None:
+            self.shared.close()
+            self.shared = None
+
+
+def _open_shared() -> Optional[SharedTable]:
+    if not CACHE_SHARED:
+        return None
+    try:
+        return SharedTable(CACHE_SHARED_PATH, CACHE_SHARED_SLOTS, CACHE_SHARED_SLOT_BYTES)
+    except (OSError, ValueError) as e:
+        # 공유 계층을 못 열면 워커 메모리 + SQLite 만으로 동작
+        print("[공유 캐시 사용 불가]", e)
+        return None
+
+
+cache = IntentCache(CACHE_PATH, CACHE_MAX_ENTRIES, CACHE_MEMORY_ENTRIES, shared=_open_shared())
@@ -0,0 +1,204 @@
+import sys
+import json
+import time
+import asyncio
+import argparse
+import os
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+# 인텐트 추출 정확도 / 지연 / 프롬프트 토큰 회귀 테스트
+# SYSTEM_PROMPT 에 적힌 예시 문장으로 만든 골든 코퍼스(tests/golden/intent_corpus.jsonl)를
+# 임의의 추출 백엔드(실제 모델, 녹화된 응답, 로컬 fast path)로 돌려 필드별 정확도를 비교한다.
+#
+#   python -m app.services.intent_eval --backend model --min-accuracy 0.9
+#   python -m app.services.intent_eval --backend model-adaptive   # 적응형 few-shot 프롬프트와 비교
+# 모델 백엔드는 운영(handle_text)과 같이 정규화한 발화를 보내고, 토큰 사용량은 운영 로그/일일 예산과 분리해
+# EVAL_USAGE_LOG_PATH 에 기록한다 (python -m app.services.usage .cache/usage-eval.jsonl).
+CORPUS_PATH = Path(__file__).resolve().parents[2] / "tests" / "golden" / "intent_corpus.jsonl"
+EVAL_USAGE_LOG_PATH = os.getenv(
+    "EVAL_USAGE_LOG_PATH",
+    str(Path(__file__).resolve().parents[2] / ".cache" / "usage-eval.jsonl"),
+)
+FIELDS = ["intents", "action", "target", "categories", "filters", "items"]
+
+# 백엔드: text -> (추출 결과 또는 None(처리 불가), 토큰 사용량 dict 또는 None)
+Extractor = Callable[[str], Awaitable[tuple]]
+BACKENDS: Dict[str, Callable[[], Extractor]] = {}
+
+
+_eval_tracker = None
+
+
+def eval_tracker():
+    # 평가 호출 전용 사용량 기록 (예산 없음)
+    global _eval_tracker
+    if _eval_tracker is None:
+        from app.services import usage
+        _eval_tracker = usage.UsageTracker(EVAL_USAGE_LOG_PATH)
+    return _eval_tracker
+
+
+def backend(name: str):
+    def register(factory):
+        BACKENDS[name] = factory
+        return factory
+    return register
+
+
+def load_corpus(path=CORPUS_PATH) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _prune(value):
+    # 빈 배열/객체는 "없음"과 같은 것으로 취급
+    if isinstance(value, dict):
+        pruned = {key: _prune(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in (None, [], {}, "")}
+    if isinstance(value, list):
+        return [_prune(item) for item in value]
+    return value
+
+
+def _normalize(field: str, value):
+    value = _prune(value)
+    if value in ([], {}, "", None):
+        return None
+    if field == "categories":
+        return sorted(value)
+    if field == "filters" and isinstance(value, dict):
+        return {key: sorted(item) if key in ("tag", "exclude_tags") and isinstance(item, list) else item
+                for key, item in value.items()}
+    return value
+
+
+def compare(expected: Dict, actual: Dict) -> Dict[str, bool]:
+    return {field: _normalize(field, expected.get(field)) == _normalize(field, actual.get(field))
+            for field in FIELDS}
+
+
+async def evaluate(extract: Extractor, corpus: List[Dict]) -> Dict:
+    cases = []
+    for case in corpus:
+        started = time.perf_counter()
+        actual, tokens = await extract(case["text"])
+        latency = time.perf_counter() - started
+        fields = compare(case["expected"], actual) if actual is not None else None
+        cases.append({
+            "text": case["text"],
+            "handled": actual is not None,
+            "fields": fields,
+            "exact": bool(fields) and all(fields.values()),
+            "latency_ms": round(latency * 1000, 2),
+            "prompt_tokens": (tokens or {}).get("prompt_tokens", 0),
+            "completion_tokens": (tokens or {}).get("completion_tokens", 0),
+            "actual": actual,
+        })
+    return {"cases": cases, "summary": summarize(cases)}
+
+
+def summarize(cases: List[Dict]) -> Dict:
+    handled = [case for case in cases if case["handled"]]
+    latencies = sorted(case["latency_ms"] for case in handled) or [0.0]
+    return {
+        "cases": len(cases),
+        "handled": len(handled),
+        "exact_accuracy": round(sum(case["exact"] for case in handled) / len(handled), 4) if handled else 0.0,
+        "field_accuracy": {
+            field: round(sum(case["fields"][field] for case in handled) / len(handled), 4) if handled else 0.0
+            for field in FIELDS
+        },
+        "prompt_tokens": sum(case["prompt_tokens"] for case in handled),
+        "completion_tokens": sum(case["completion_tokens"] for case in handled),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+    }
+
+
+@backend("expected")
+def expected_backend() -> Extractor:
+    # 코퍼스 기대값을 그대로 돌려주는 기준선 (러너 자체 점검용)
+    answers = {case["text"]: case["expected"] for case in load_corpus()}
+
+    async def extract(text: str):
+        return answers.get(text), None
+    return extract
+
+
+@backend("slot")
+def slot_backend() -> Extractor:
+    # 페이지별 단답 문법 (처리하지 못한 발화는 handled=False 로 집계되어 커버리지를 보여줌)
+    from app.services import slot_parser
+
+    async def extract(text: str):
+        return slot_parser.parse_slots(text), None
+    return extract
+
+
+@backend("model")
+def model_backend() -> Extractor:
+    # 캐시를 거치지 않고 call_openai 를 직접 호출 (COMPLETION 설정에 따라 실제 API 또는 녹화 응답)
+    from app.services import normalize, openai_client
+
+    tracker = eval_tracker()
+
+    async def extract(text: str):
+        tracker.last = None
+        messages = openai_client.make_messages(normalize.normalize(text))
+        result = await openai_client.call_openai(messages, "eval", tracker=tracker)
+        return result, tracker.last
+    return extract
+
+
+@backend("model-adaptive")
+def adaptive_model_backend() -> Extractor:
+    # 규칙 요약 + 유사 예시 프롬프트. 예시 저장소가 코퍼스와 겹치므로 같은 발화의 예시는 빼고 고름
+    from app.services import few_shot, normalize, openai_client, runtime_config
+
+    tracker = eval_tracker()
+
+    async def extract(text: str):
+        tracker.last = None
+        config = runtime_config.current()
+        messages = few_shot.make_messages(normalize.normalize(text), config, exclude=text)
+        result = await openai_client.call_openai(messages, "eval", config, tracker)
+        return result, tracker.last
+    return extract
+
+
+def print_report(report: Dict, out=sys.stdout, show_failures: bool = True):
+    summary = report["summary"]
+    print(f"cases: {summary['cases']}  handled: {summary['handled']}  "
+          f"exact: {summary['exact_accuracy']:.1%}", file=out)
+    print("fields: " + "  ".join(f"{field}={acc:.1%}" for field, acc in summary["field_accuracy"].items()), file=out)
+    print(f"tokens: prompt={summary['prompt_tokens']} completion={summary['completion_tokens']}  "
+          f"latency: p50={summary['p50_ms']}ms p95={summary['p95_ms']}ms", file=out)
+    if show_failures:
+        for case in report["cases"]:
+            if case["handled"] and not case["exact"]:
+                wrong = [field for field, ok in case["fields"].items() if not ok]
+                print(f"  ✗ {case['text']} ({', '.join(wrong)}): "
+                      f"{json.dumps(case['actual'], ensure_ascii=False)}", file=out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="골든 코퍼스 인텐트 추출 회귀 테스트")
+    parser.add_argument("--backend", default="model", choices=sorted(BACKENDS))
+    parser.add_argument("--corpus", default=str(CORPUS_PATH))
+    parser.add_argument("--min-accuracy", type=float, default=0.0)
+    parser.add_argument("--json", action="store_true", help="리포트를 JSON 으로 출력")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(evaluate(BACKENDS[args.backend](), load_corpus(args.corpus)))
+    if _eval_tracker is not None:
+        _eval_tracker.close()
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+    return 0 if report["summary"]["exact_accuracy"] >= args.min_accuracy else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
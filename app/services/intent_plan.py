@@ -0,0 +1,81 @@
+import os
+import asyncio
+from typing import Awaitable, Callable, Dict, List
+
+# 다중 인텐트 실행 계획
+# intents 사이의 의존 관계(장바구니 상태를 읽는지/바꾸는지)로 그래프를 만들고,
+# 서로 연결된 인텐트끼리는 원래 순서대로 하나의 query.sequence 로 묶고,
+# 연결되지 않은 묶음끼리는 동시에 백엔드로 보낸다.
+#   예) ["recommend", "order.add"]           → [["recommend"], ["order.add"]] (동시)
+#       ["order.add", "confirm"] (cart 확인)  → [["order.add", "confirm"]]     (순서 유지)
+# 나뉘면 응답이 묶음별 배열이 되므로(키오스크 클라이언트가 배열을 처리해야 함) 기본은 꺼 둠
+PLAN_PARALLEL = os.getenv("INTENT_PLAN_PARALLEL", "false").lower() == "true"
+
+# 장바구니/주문 상태를 바꾸는 인텐트
+STATE_CHANGING = {"order.add", "order.update", "order.delete", "order.pay", "exit"}
+# 장바구니/주문 상태를 읽는 confirm 대상 (target 이 없으면 읽는 것으로 간주)
+STATE_READING_TARGETS = {"cart", "order", "price", None}
+# 묶음을 나눌 때 각 인텐트가 가져가는 필드 (나머지 인텐트의 묶음에는 넣지 않음)
+FIELD_OWNERS = {
+    "items": {"order.add", "order.update", "order.delete", "order.pay", "confirm"},
+    "action": {"order.add", "order.update", "order.delete", "order.pay", "confirm"},
+    # target 은 프롬프트상 confirm 요청의 대상 (cart/order/price/menu)
+    "target": {"confirm"},
+    "categories": {"recommend", "confirm"},
+    "filters": {"recommend", "confirm"},
+}
+
+
+def writes_state(intent: str) -> bool:
+    return intent in STATE_CHANGING
+
+
+def reads_state(intent: str, intent_result: Dict) -> bool:
+    return intent == "confirm" and intent_result.get("target") in STATE_READING_TARGETS
+
+
+def plan(intent_result: Dict) -> List[List[str]]:
+    intents = list(intent_result.get("intents") or [])
+    if not PLAN_PARALLEL or len(intents) <= 1:
+        return [intents] if intents else []
+
+    parent = list(range(len(intents)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    touches = [writes_state(intent) or reads_state(intent, intent_result) for intent in intents]
+    for j in range(len(intents)):
+        for i in range(j):
+            # 쓰기 ↔ 쓰기, 쓰기 ↔ 읽기는 순서를 바꾸면 결과가 달라지므로 같은 묶음
+            if (writes_state(intents[i]) and touches[j]) or (touches[i] and writes_state(intents[j])):
+                parent[find(j)] = find(i)
+
+    groups: Dict[int, List[str]] = {}
+    for index, intent in enumerate(intents):
+        groups.setdefault(find(index), []).append(intent)
+    # 묶음은 첫 인텐트가 등장한 순서대로
+    return list(groups.values())
+
+
+def split(intent_result: Dict, intents: List[str]) -> Dict:
+    # 묶음에 속한 인텐트의 필드만 남김 (filters 는 프롬프트 형식대로 항상 포함)
+    group = {"intents": intents, "filters": {}}
+    for field, value in intent_result.items():
+        if field == "intents":
+            continue
+        owners = FIELD_OWNERS.get(field)
+        if owners is None or owners.intersection(intents):
+            group[field] = value
+    return group
+
+
+async def execute(intent_result: Dict, dispatch: Callable[[Dict], Awaitable[Dict]]):
+    # 묶음이 하나면 기존과 동일하게 단일 응답, 여러 개면 묶음 순서대로 응답 리스트를 반환
+    groups = plan(intent_result)
+    if len(groups) <= 1:
+        return await dispatch(intent_result)
+    return list(await asyncio.gather(*(dispatch(split(intent_result, group)) for group in groups)))
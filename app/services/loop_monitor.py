@@ -0,0 +1,97 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+import traceback
+from typing import Optional
+
+from app.services import metrics
+
+# 이벤트 루프 지연(lag) 모니터
+# - LOOP_LAG_INTERVAL 마다 sleep 을 걸어 실제로 깨어난 시각과의 차이를 event_loop_lag 메트릭으로 기록
+# - LOOP_DEBUG=true 이면 별도 감시 스레드가 루프 heartbeat 를 확인하고,
+#   LOOP_BLOCK_THRESHOLD_MS 이상 루프가 멈춰 있으면 그 순간 루프 스레드의 스택을 출력
+#   asyncio 디버그 모드도 켜서 같은 기준보다 오래 걸린 콜백을 asyncio 로거로 남김
+#   (OpenAI 동기 호출, 동기 파일/DB I/O 같은 blocking 회귀를 잡기 위한 용도)
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", 0.5))
+LOOP_DEBUG = os.getenv("LOOP_DEBUG", "false").lower() == "true"
+LOOP_BLOCK_THRESHOLD_MS = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", 100))
+
+
+class LoopMonitor:
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, debug: bool = LOOP_DEBUG,
+                 block_threshold_ms: float = LOOP_BLOCK_THRESHOLD_MS):
+        self.interval = interval
+        self.debug = debug
+        self.block_threshold = block_threshold_ms / 1000
+        self.max_lag = 0.0
+        self.blocked_stacks = []
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = loop.create_task(self._measure())
+        if self.debug:
+            # asyncio 디버그 모드를 켜서 자체 로그("Executing <Task ...> took N seconds")도 같은 기준으로 남김
+            # (디버그 모드는 코루틴 생성 위치 추적 등 오버헤드가 있으므로 LOOP_DEBUG 일 때만)
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.block_threshold
+            self._watchdog = threading.Thread(target=self._watch, daemon=True)
+            self._watchdog.start()
+
+    async def _measure(self):
+        # 감시 스레드가 짧은 정지도 볼 수 있도록 heartbeat 는 임계값보다 자주 갱신
+        tick = min(self.interval, self.block_threshold / 2) if self.debug else self.interval
+        loop = asyncio.get_running_loop()
+        last_report = loop.time()
+        while True:
+            expected = loop.time() + tick
+            await asyncio.sleep(tick)
+            now = loop.time()
+            lag = max(now - expected, 0.0)
+            self._heartbeat = time.monotonic()
+            self.max_lag = max(self.max_lag, lag)
+            metrics.observe("event_loop_lag_seconds", lag)
+            if now - last_report >= self.interval:
+                metrics.set_gauge("event_loop_lag_ms", round(lag * 1000, 2))
+                metrics.set_gauge("event_loop_lag_max_ms", round(self.max_lag * 1000, 2))
+                last_report = now
+
+    def _watch(self):
+        reported_for = None
+        while not self._stop.wait(self.block_threshold / 4):
+            beat = self._heartbeat
+            stalled = time.monotonic() - beat
+            if stalled < self.block_threshold or reported_for == beat:
+                continue
+            # 같은 정지에 대해서는 한 번만 보고
+            reported_for = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            self.blocked_stacks.append(stack)
+            del self.blocked_stacks[:-20]
+            metrics.inc("event_loop_blocked")
+            print(f"[이벤트 루프 blocking 감지] {stalled * 1000:.0f}ms 이상 멈춤\n{stack}", file=sys.stderr)
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+monitor = LoopMonitor()
@@ -0,0 +1,39 @@
+import os
+import sys
+import tracemalloc
+
+# 메모리 계측 / 크기 추정 유틸
+# MEMORY_TRACKING=true 이면 tracemalloc 을 켜고, profiling.span 구간마다 할당량(bytes)을
+# alloc_bytes{stage=...} 분포로 기록한다. 동시에 처리 중인 요청의 할당도 섞이는 근사값이다.
+MEMORY_TRACKING = os.getenv("MEMORY_TRACKING", "false").lower() == "true"
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", 1))
+
+
+def start():
+    if MEMORY_TRACKING and not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+
+def tracking() -> bool:
+    return tracemalloc.is_tracing()
+
+
+def allocated() -> int:
+    return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+def sizeof(obj) -> int:
+    # JSON 형태(dict/list/str/숫자) 객체의 대략적인 메모리 크기
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(sizeof(key) + sizeof(value) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(sizeof(item) for item in obj)
+    return size
+
+
+def top_allocations(limit: int = 20):
+    if not tracemalloc.is_tracing():
+        return []
+    stats = tracemalloc.take_snapshot().statistics("lineno")[:limit]
+    return [{"where": str(stat.traceback), "size": stat.size, "count": stat.count} for stat in stats]
@@ -0,0 +1,282 @@
+import json
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+
+from app.services import runtime_config
+
+# recommend 인텐트의 filters 를 NLP 서버에서 미리 평가하는 메뉴 필터 엔진
+# 메뉴를 열(column) 단위로 들고 있고, 태그/카테고리/재료는 "메뉴 인덱스 비트셋"(int)으로 표현해
+# 조건 하나를 AND/OR 비트 연산 한 번으로 평가한다.
+# 메뉴 데이터는 runtime_config 스냅샷에서 가져오며, 메뉴 파일이 바뀌었을 때만 엔진을 다시 만든다.
+
+CATEGORIES = ["커피", "음료", "디저트", "디카페인"]
+FILTER_KEYS = {
+    "price", "tag", "exclude_tags", "caffeine", "include_ingredients",
+    "exclude_ingredients", "count", "group_counts",
+}
+DEFAULT_COUNT = 3
+# 손님(주문하는 사람)을 나누는 group_counts 키 ({"gender_male": 3, "gender_female": 2} = 남자 3명, 여자 2명)
+# 메뉴에 같은 이름의 태그가 있으면 그 태그로 고르고, 없으면 메뉴 조건 없이 인원 수만큼 고름
+PERSON_GROUP_KEYS = {"gender_male", "gender_female", "young", "old"}
+
+
+def _bits(mask: int):
+    index = 0
+    while mask:
+        if mask & 1:
+            yield index
+        mask >>= 1
+        index += 1
+
+
+def _as_list(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+def _number(value) -> Optional[float]:
+    # 모델이 가격을 "3000" 처럼 문자열로 주는 경우도 숫자로 읽음 (null, 숫자가 아닌 값은 None)
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value.replace(",", "").replace("원", "").strip())
+        except ValueError:
+            return None
+    return None
+
+
+def _count(value) -> Optional[int]:
+    # 추천 개수: 양의 정수만 (bool 은 int 의 하위 타입이라 따로 제외)
+    if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+        return value
+    return None
+
+
+def _price_range(price: Dict) -> Dict[str, float]:
+    # 숫자로 읽을 수 있는 min/max 만 남김 (나머지는 validate 에서 보고하고 조건에서 제외)
+    bounds = {}
+    for key in ("min", "max"):
+        number = _number(price.get(key))
+        if number is not None:
+            bounds[key] = number
+    return bounds
+
+
+class MenuFilterEngine:
+    def __init__(self, menu: List[Dict]):
+        self.ids = [item.get("id", item["name"]) for item in menu]
+        self.names = [item["name"] for item in menu]
+        self.prices = [int(item.get("price", 0)) for item in menu]
+        self.all_mask = (1 << len(menu)) - 1
+
+        self.category_masks: Dict[str, int] = {}
+        self.tag_masks: Dict[str, int] = {}
+        self.ingredient_masks: Dict[str, int] = {}
+        self.decaf_mask = 0
+        for index, item in enumerate(menu):
+            bit = 1 << index
+            category = item.get("category")
+            self.category_masks[category] = self.category_masks.get(category, 0) | bit
+            for tag in item.get("tags", []):
+                self.tag_masks[tag] = self.tag_masks.get(tag, 0) | bit
+            for ingredient in item.get("ingredients", []):
+                self.ingredient_masks[ingredient] = self.ingredient_masks.get(ingredient, 0) | bit
+            if category == "디카페인" or item.get("caffeine") is False or item.get("decaf"):
+                self.decaf_mask |= bit
+
+        # 가격 범위 조건은 정렬된 가격 배열에서 이분 탐색으로 구간을 잘라 비트셋으로 만든다
+        self._price_order = sorted(range(len(menu)), key=lambda i: self.prices[i])
+        self._sorted_prices = [self.prices[i] for i in self._price_order]
+
+    @classmethod
+    def from_file(cls, path: str) -> "MenuFilterEngine":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["menu"] if isinstance(data, dict) else data)
+
+    def _price_mask(self, price: Dict[str, float]) -> int:
+        low = bisect_left(self._sorted_prices, price["min"]) if "min" in price else 0
+        high = bisect_right(self._sorted_prices, price["max"]) if "max" in price else len(self._sorted_prices)
+        mask = 0
+        for position in range(low, high):
+            mask |= 1 << self._price_order[position]
+        return mask
+
+    def _any_mask(self, masks: Dict[str, int], keys: List[str]) -> int:
+        mask = 0
+        for key in keys:
+            mask |= masks.get(key, 0)
+        return mask
+
+    def validate(self, intent_result: Dict) -> List[str]:
+        issues = []
+        filters = intent_result.get("filters") or {}
+        if not isinstance(filters, dict):
+            return ["filters must be an object"]
+
+        for key in filters:
+            if key not in FILTER_KEYS:
+                issues.append(f"unknown filter: {key}")
+        for category in _as_list(intent_result.get("categories")):
+            if category not in CATEGORIES:
+                issues.append(f"unknown category: {category}")
+
+        price = filters.get("price")
+        if price is not None:
+            if not isinstance(price, dict):
+                issues.append("price must be an object")
+            else:
+                if price.get("sort") not in (None, "asc", "desc"):
+                    issues.append(f"unknown price sort: {price.get('sort')}")
+                for key in ("min", "max"):
+                    if key in price and _number(price[key]) is None:
+                        issues.append(f"invalid price.{key}: {price[key]!r}")
+                bounds = _price_range(price)
+                if "min" in bounds and "max" in bounds and bounds["min"] > bounds["max"]:
+                    issues.append("price.min is greater than price.max")
+
+        count = filters.get("count")
+        if count is not None and _count(count) is None:
+            issues.append(f"invalid count: {count!r}")
+
+        group_counts = filters.get("group_counts")
+        if group_counts is not None:
+            if not isinstance(group_counts, dict):
+                issues.append("group_counts must be an object")
+            else:
+                for key, value in group_counts.items():
+                    if _count(value) is None:
+                        issues.append(f"invalid group count: {key}={value!r}")
+                    if key.startswith("tag:"):
+                        parts = key.split(":")
+                        if len(parts) != 3 or parts[1] not in CATEGORIES:
+                            issues.append(f"invalid group key: {key}")
+                    elif key not in CATEGORIES and key not in self.tag_masks and key not in PERSON_GROUP_KEYS:
+                        issues.append(f"unknown group key: {key}")
+
+        for tag in _as_list(filters.get("tag")) + _as_list(filters.get("exclude_tags")):
+            if tag not in self.tag_masks:
+                issues.append(f"unknown tag: {tag}")
+        return issues
+
+    def base_mask(self, intent_result: Dict) -> int:
+        filters = intent_result.get("filters") or {}
+        mask = self.all_mask
+
+        categories = _as_list(intent_result.get("categories"))
+        if categories:
+            mask &= self._any_mask(self.category_masks, categories)
+
+        price = filters.get("price")
+        bounds = _price_range(price) if isinstance(price, dict) else {}
+        if bounds:
+            mask &= self._price_mask(bounds)
+
+        if filters.get("caffeine") == "decaf":
+            mask &= self.decaf_mask
+
+        # 메뉴에 없는 태그는 조건에서 제외 (validate 에서 따로 보고)
+        tags = [tag for tag in _as_list(filters.get("tag")) if tag in self.tag_masks]
+        if tags:
+            mask &= self._any_mask(self.tag_masks, tags)
+        mask &= ~self._any_mask(self.tag_masks, _as_list(filters.get("exclude_tags")))
+
+        for ingredient in _as_list(filters.get("include_ingredients")):
+            mask &= self.ingredient_masks.get(ingredient, 0)
+        mask &= ~self._any_mask(self.ingredient_masks, _as_list(filters.get("exclude_ingredients")))
+        return mask
+
+    def rank(self, mask: int, filters: Dict) -> List[int]:
+        indices = list(_bits(mask))
+        price = filters.get("price") if isinstance(filters.get("price"), dict) else {}
+        sort = price.get("sort")
+        if sort in ("asc", "desc"):
+            indices.sort(key=lambda i: self.prices[i], reverse=(sort == "desc"))
+            return indices
+
+        # 요청 태그와 많이 겹칠수록, popular 태그가 있을수록 앞으로 (동점이면 메뉴 순서 유지)
+        scores = [0] * len(self.ids)
+        for tag in _as_list(filters.get("tag")):
+            for index in _bits(self.tag_masks.get(tag, 0) & mask):
+                scores[index] += 2
+        for index in _bits(self.tag_masks.get("popular", 0) & mask):
+            scores[index] += 1
+        indices.sort(key=lambda i: -scores[i])
+        return indices
+
+    def _group_mask(self, key: str, base: int) -> int:
+        if key.startswith("tag:"):
+            parts = key.split(":")
+            if len(parts) != 3:
+                return 0
+            _, category, tag = parts
+            return base & self.category_masks.get(category, 0) & self.tag_masks.get(tag, 0)
+        if key in CATEGORIES:
+            return base & self.category_masks.get(key, 0)
+        if key in PERSON_GROUP_KEYS and key not in self.tag_masks:
+            return base
+        # 태그 키: categories 가 있으면 그 안에서만 (base 에 이미 반영됨)
+        return base & self.tag_masks.get(key, 0)
+
+    def evaluate(self, intent_result: Dict) -> Dict:
+        filters = intent_result.get("filters") or {}
+        issues = self.validate(intent_result)
+        base = self.base_mask(intent_result)
+        ranked = self.rank(base, filters)
+
+        group_counts = filters.get("group_counts")
+        if isinstance(group_counts, dict) and group_counts:
+            chosen = 0
+            groups = {}
+            for key, value in group_counts.items():
+                count = _count(value)
+                if count is None:
+                    # 개수가 잘못된 묶음은 건너뜀 (validate 에서 보고)
+                    continue
+                group_mask = self._group_mask(key, base) & ~chosen
+                picked = self.rank(group_mask, filters)[:count]
+                for index in picked:
+                    chosen |= 1 << index
+                groups[key] = [self.ids[i] for i in picked]
+                if len(picked) < count:
+                    issues.append(f"group {key} has {len(picked)} of {count} candidates")
+            candidates = [cid for ids in groups.values() for cid in ids]
+            result = {"candidates": candidates, "candidate_groups": groups}
+        else:
+            count = _count(filters.get("count")) or DEFAULT_COUNT
+            candidates = [self.ids[i] for i in ranked[:count]]
+            result = {"candidates": candidates}
+
+        if not candidates:
+            issues.append("no_match")
+        result["filter_issues"] = issues
+        return result
+
+
+_engine: Optional[MenuFilterEngine] = None
+_engine_version: Optional[str] = None
+
+
+def get_engine(config: Optional[runtime_config.ConfigSnapshot] = None) -> Optional[MenuFilterEngine]:
+    global _engine, _engine_version
+    config = config or runtime_config.current()
+    if config.menu_version != _engine_version:
+        _engine = MenuFilterEngine(config.menu) if config.menu is not None else None
+        _engine_version = config.menu_version
+    return _engine
+
+
+def annotate(intent_result: Dict, payload: Dict, config: Optional[runtime_config.ConfigSnapshot] = None):
+    # recommend 요청이면 후보 메뉴 ID 를 payload 에 붙여 백엔드가 바로 사용할 수 있게 함
+    if "recommend" not in (intent_result.get("intents") or []):
+        return
+    engine = get_engine(config)
+    if engine is None:
+        return
+    payload.update(engine.evaluate(intent_result))
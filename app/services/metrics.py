@@ -0,0 +1,115 @@
+import os
+import threading
+from collections import defaultdict, deque
+from typing import Dict
+
+# 프로세스 내 간단한 메트릭 저장소 (/voice/metrics 로 노출)
+# - counter: 누적 값
+# - gauge: 현재 값
+# - timing: 최근 TIMING_WINDOW 개 샘플(초)의 분위수
+# - distribution: 최근 TIMING_WINDOW 개 샘플(임의 단위, 예: bytes)의 분위수
+# 라벨 조합(series) 수는 METRICS_MAX_SERIES 로 제한 (클라이언트가 보낸 page 값 등으로 무한히 늘어나지 않도록)
+TIMING_WINDOW = 1024
+METRICS_MAX_SERIES = int(os.getenv("METRICS_MAX_SERIES", 2000))
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = defaultdict(float)
+_gauges: Dict[str, float] = {}
+_timings: Dict[str, deque] = {}
+_values: Dict[str, deque] = {}
+_dropped = 0
+
+
+def _series_count() -> int:
+    return len(_counters) + len(_gauges) + len(_timings) + len(_values)
+
+
+def _admit(store: Dict, key: str) -> bool:
+    global _dropped
+    if key in store or _series_count() < METRICS_MAX_SERIES:
+        return True
+    _dropped += 1
+    return False
+
+
+def _name(name: str, labels: Dict) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in sorted(labels.items())) + "}"
+
+
+def inc(name: str, value: float = 1, **labels):
+    key = _name(name, labels)
+    with _lock:
+        if _admit(_counters, key):
+            _counters[key] += value
+
+
+def set_gauge(name: str, value: float, **labels):
+    key = _name(name, labels)
+    with _lock:
+        if _admit(_gauges, key):
+            _gauges[key] = value
+
+
+def _append(store: Dict[str, deque], key: str, value: float):
+    with _lock:
+        samples = store.get(key)
+        if samples is None:
+            if not _admit(store, key):
+                return
+            samples = store[key] = deque(maxlen=TIMING_WINDOW)
+        samples.append(value)
+
+
+def observe(name: str, seconds: float, **labels):
+    _append(_timings, _name(name, labels), seconds)
+
+
+def record(name: str, value: float, **labels):
+    _append(_values, _name(name, labels), value)
+
+
+def _percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def snapshot() -> Dict:
+    with _lock:
+        timings = {
+            key: {
+                "count": len(samples),
+                "p50_ms": round(_percentile(samples, 0.5) * 1000, 2),
+                "p95_ms": round(_percentile(samples, 0.95) * 1000, 2),
+                "p99_ms": round(_percentile(samples, 0.99) * 1000, 2),
+                "max_ms": round(max(samples) * 1000, 2),
+            }
+            for key, samples in _timings.items() if samples
+        }
+        distributions = {
+            key: {
+                "count": len(samples),
+                "p50": _percentile(samples, 0.5),
+                "p95": _percentile(samples, 0.95),
+                "max": max(samples),
+            }
+            for key, samples in _values.items() if samples
+        }
+        return {
+            "counters": dict(_counters),
+            "gauges": dict(_gauges),
+            "timings": timings,
+            "distributions": distributions,
+            "dropped_series": _dropped,
+        }
+
+
+def reset():
+    global _dropped
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _timings.clear()
+        _values.clear()
+        _dropped = 0
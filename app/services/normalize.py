@@ -0,0 +1,78 @@
+import re
+from typing import Dict
+
+# 음성 인식 결과 정규화 (handle_text 맨 앞에서 한 번만 적용)
+# - 공백/문장부호 정리
+# - 고유어 수사 → 숫자 ("두 개" → "2개", "샷 하나" → "샷 1개")
+# - 사이즈/온도 동의어 → 프롬프트 표기 ("라지" → "L", "아아" → "아이스 아메리카노")
+# - 문장 끝 높임 표현 → 반말 ("주세요" → "줘", "S로요" → "S로")
+# 모든 표는 import 시점에 하나의 정규식으로 컴파일해 요청마다 문자열을 한 번씩만 훑는다.
+
+NUMERALS: Dict[str, str] = {
+    "한": "1", "하나": "1", "두": "2", "둘": "2", "세": "3", "석": "3", "셋": "3",
+    "네": "4", "넉": "4", "넷": "4", "다섯": "5", "여섯": "6", "일곱": "7",
+    "여덟": "8", "아홉": "9", "열": "10",
+}
+COUNTERS = ["개", "잔", "명", "샷", "조각", "병"]
+
+SIZES: Dict[str, str] = {
+    "라지": "L", "라아지": "L", "large": "L", "엘": "L",
+    "미디움": "M", "미디엄": "M", "미듐": "M", "medium": "M", "엠": "M",
+    "스몰": "S", "small": "S", "에스": "S",
+}
+# 메뉴 줄임말 → 온도 옵션 + 메뉴 이름
+SHORTHANDS: Dict[str, str] = {
+    "아아": "아이스 아메리카노",
+    "뜨아": "핫 아메리카노",
+    "따아": "핫 아메리카노",
+}
+TEMPERATURES: Dict[str, str] = {
+    "ice": "아이스", "iced": "아이스", "아이스드": "아이스",
+    "hot": "핫",
+}
+ENDINGS: Dict[str, str] = {
+    "해주세요": "해줘", "해 주세요": "해줘", "주세요": "줘", "주실래요": "줘", "줄래요": "줘",
+    "주시겠어요": "줘", "부탁해요": "부탁해", "부탁드려요": "부탁해",
+    "할게요": "할게", "할래요": "할래", "로요": "로", "으로요": "으로",
+}
+
+# 단어 뒤에 붙어도 되는 조사/어미 (이 경우에도 동의어로 인정)
+_PARTICLE = r"(?=$|\s|[,.?!]|으로|로|요|는|은|가|이|사이즈|랑|하고)"
+_BOUNDARY = r"(?<![0-9A-Za-z가-힣])"
+
+
+def _alternation(words) -> str:
+    # 긴 단어가 먼저 매칭되도록 길이 역순
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+_SPACES = re.compile(r"\s+")
+_TRAILING_PUNCT = re.compile(r"[\s.!~]+$")
+_NUMERAL_COUNTER = re.compile(
+    _BOUNDARY + r"(" + _alternation(NUMERALS) + r")\s*(" + _alternation(COUNTERS) + r")"
+)
+# "둘 다", "셋 다요" 의 수사는 수량이 아니라 "모두"의 뜻이므로 바꾸지 않음
+_BARE_NUMERAL = re.compile(_BOUNDARY + r"(하나|둘|셋|넷)(?!\s*다(?:$|\s|[,.?!]|요))(?=$|\s|[,.?!]|만)")
+_DIGIT_COUNTER = re.compile(r"(\d+)\s+(" + _alternation(COUNTERS) + r")")
+_SIZE = re.compile(_BOUNDARY + r"(" + _alternation(SIZES) + r")" + _PARTICLE, re.IGNORECASE)
+_SIZE_LETTER = re.compile(r"(?<![A-Za-z])([sml])(?![A-Za-z])")
+_SHORTHAND = re.compile(_BOUNDARY + r"(" + _alternation(SHORTHANDS) + r")" + _PARTICLE)
+_TEMPERATURE = re.compile(_BOUNDARY + r"(" + _alternation(TEMPERATURES) + r")" + _PARTICLE, re.IGNORECASE)
+_ENDING = re.compile(r"(" + _alternation(ENDINGS) + r")(?=\??$)")
+
+
+def normalize(text: str) -> str:
+    text = _SPACES.sub(" ", text).strip()
+    text = _TRAILING_PUNCT.sub("", text)
+    if not text:
+        return text
+
+    text = _SHORTHAND.sub(lambda m: SHORTHANDS[m.group(1)], text)
+    text = _NUMERAL_COUNTER.sub(lambda m: NUMERALS[m.group(1)] + m.group(2), text)
+    text = _BARE_NUMERAL.sub(lambda m: NUMERALS[m.group(1)] + "개", text)
+    text = _DIGIT_COUNTER.sub(r"\1\2", text)
+    text = _SIZE.sub(lambda m: SIZES[m.group(1).lower()], text)
+    text = _SIZE_LETTER.sub(lambda m: m.group(1).upper(), text)
+    text = _TEMPERATURE.sub(lambda m: TEMPERATURES[m.group(1).lower()], text)
+    text = _ENDING.sub(lambda m: ENDINGS[m.group(1)], text)
+    return text
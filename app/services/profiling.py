@@ -0,0 +1,201 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+import contextvars
+from collections import Counter, deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.services import memory, metrics
+
+# 요청 경로 프로파일링
+# - span: 요청 단위 트레이스 안에서 구간별 wall / CPU 시간 기록 (PROFILING_ENABLED 일 때만, 꺼져 있으면 no-op)
+# - 느린 요청: 전체 시간이 SLOW_REQUEST_MS 를 넘으면 트레이스를 SLOW_TRACE_DIR 에 JSON 으로 저장
+#   (파일 쓰기는 스레드에서, 최근 SLOW_TRACE_KEEP 개만 남김)
+# - MEMORY_TRACKING 이 켜져 있으면 span / 요청마다 할당량(alloc_bytes)도 함께 기록
+# - SamplingProfiler: 관리자 API 로 N 초 동안 스택을 샘플링해 collapsed stack(flame graph 입력) 생성
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", 2000))
+SLOW_TRACE_DIR = os.getenv(
+    "SLOW_TRACE_DIR",
+    str(Path(__file__).resolve().parents[2] / ".cache" / "traces"),
+)
+SLOW_TRACE_KEEP = int(os.getenv("SLOW_TRACE_KEEP", 200))
+SAMPLE_INTERVAL = float(os.getenv("PROFILER_SAMPLE_INTERVAL", 0.005))
+RECENT_TRACES = 50
+MAX_PROFILE_STACKS = 20000
+
+_current: contextvars.ContextVar = contextvars.ContextVar("request_trace", default=None)
+recent_slow_traces: deque = deque(maxlen=RECENT_TRACES)
+
+
+class RequestTrace:
+    def __init__(self, name: str, **meta):
+        self.name = name
+        self.meta = meta
+        self.spans: List[Dict] = []
+        self.started = time.perf_counter()
+        self.cpu_started = time.thread_time()
+        self.wall_ms = 0.0
+        self.cpu_ms = 0.0
+
+    def finish(self):
+        self.wall_ms = (time.perf_counter() - self.started) * 1000
+        # async 에서는 같은 스레드의 다른 코루틴 CPU 시간도 포함되는 근사값
+        self.cpu_ms = (time.thread_time() - self.cpu_started) * 1000
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "meta": self.meta,
+            "wall_ms": round(self.wall_ms, 2),
+            "cpu_ms": round(self.cpu_ms, 2),
+            "spans": self.spans,
+        }
+
+
+@contextmanager
+def span(name: str):
+    trace = _current.get()
+    tracking = memory.tracking()
+    if trace is None and not tracking:
+        yield
+        return
+    started = time.perf_counter()
+    cpu_started = time.thread_time()
+    allocated_before = memory.allocated()
+    try:
+        yield
+    finally:
+        alloc_bytes = memory.allocated() - allocated_before
+        if tracking:
+            metrics.record("alloc_bytes", alloc_bytes, stage=name)
+        if trace is not None:
+            trace.spans.append({
+                "name": name,
+                "start_ms": round((started - trace.started) * 1000, 2),
+                "wall_ms": round((time.perf_counter() - started) * 1000, 2),
+                "cpu_ms": round((time.thread_time() - cpu_started) * 1000, 2),
+                "alloc_bytes": alloc_bytes,
+            })
+
+
+@contextmanager
+def trace_request(name: str, **meta):
+    tracking = memory.tracking()
+    if not PROFILING_ENABLED and not tracking:
+        yield None
+        return
+    trace = RequestTrace(name, **meta) if PROFILING_ENABLED else None
+    token = _current.set(trace)
+    allocated_before = memory.allocated()
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+        if tracking:
+            metrics.record("alloc_bytes", memory.allocated() - allocated_before, stage="request")
+        if trace is not None:
+            trace.finish()
+            metrics.observe("request_seconds", trace.wall_ms / 1000, path=name)
+            if trace.wall_ms >= SLOW_REQUEST_MS:
+                _capture_slow(trace)
+
+
+def _capture_slow(trace: RequestTrace):
+    metrics.inc("slow_requests", path=trace.name)
+    data = trace.to_dict()
+    recent_slow_traces.append(data)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # 루프 밖(스크립트/테스트)에서는 바로 저장
+        _write_trace(data)
+        return
+    # 요청 미들웨어 안이므로 파일 쓰기/정리는 이벤트 루프를 막지 않도록 스레드에서
+    loop.run_in_executor(None, _write_trace, data)
+
+
+def _write_trace(data: Dict):
+    try:
+        directory = Path(SLOW_TRACE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{int(time.time() * 1000)}-{data['name'].strip('/').replace('/', '_')}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        # 파일 이름이 밀리초 타임스탬프로 시작하므로 이름순 = 시간순
+        for old in sorted(directory.glob("*.json"))[:-SLOW_TRACE_KEEP]:
+            old.unlink(missing_ok=True)
+    except OSError as e:
+        print("[느린 요청 트레이스 저장 실패]", e)
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float) -> bool:
+        if self.running:
+            return False
+        self.samples = Counter()
+        self.sample_count = 0
+        self.started_at = time.time()
+        self.duration = seconds
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(seconds,), daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self, seconds: float):
+        own = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                if key not in self.samples and len(self.samples) >= MAX_PROFILE_STACKS:
+                    key = "[truncated]"
+                self.samples[key] += 1
+            self.sample_count += 1
+            self._stop.wait(self.interval)
+
+    def collapsed(self) -> str:
+        # flamegraph.pl / speedscope 에서 바로 읽을 수 있는 "a;b;c count" 형식
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common()) + "\n"
+
+    def status(self) -> Dict:
+        return {
+            "running": self.running,
+            "started_at": self.started_at,
+            "seconds": self.duration,
+            "samples": self.sample_count,
+            "stacks": len(self.samples),
+        }
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,109 @@
+import os
+import copy
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.services import memory, metrics
+
+# 멱등 요청의 백엔드 응답 캐시
+# 메뉴 보기/메뉴 존재 확인(confirm + target "menu")은 세션과 무관하게 메뉴가 바뀌기 전까지 같은 응답이므로,
+# sessionId 를 뺀 요청 전체(정규화한 JSON)를 키로 백엔드 응답을 TTL 동안 재사용한다.
+# - 메뉴 버전(MENU_DATA_PATH 파일)이 바뀌면 전부 비움
+# - 관리자 API (DELETE /admin/backend-cache)로 즉시 비울 수 있음
+RESPONSE_CACHE_ENABLED = os.getenv("BACKEND_RESPONSE_CACHE", "true").lower() != "false"
+RESPONSE_CACHE_TTL = float(os.getenv("BACKEND_RESPONSE_CACHE_TTL", 60))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("BACKEND_RESPONSE_CACHE_MAX_ENTRIES", 1000))
+# 메뉴 응답은 크기가 제각각이므로 엔트리 수와 별도로 전체 크기(memory.sizeof 추정치)도 제한
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("BACKEND_RESPONSE_CACHE_MAX_BYTES", 4 * 1024 * 1024))
+
+
+def cache_key(data: Dict) -> Optional[str]:
+    payload = data.get("payload") or {}
+    if payload.get("intents") != ["confirm"] or payload.get("target") != "menu":
+        return None
+    request = {key: value for key, value in data.items() if key != "sessionId"}
+    return json.dumps(request, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+class ResponseCache:
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+                 max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self._lock = threading.Lock()
+        # key -> (만료 시각, 응답, 추정 크기)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._version = ""
+
+    def _clear(self):
+        self._entries.clear()
+        self.bytes_used = 0
+
+    def _remove(self, key: str):
+        self.bytes_used -= self._entries.pop(key)[2]
+
+    def _sync_version(self, version: str):
+        # 메뉴가 바뀌면 이전 응답은 모두 무효 (호출하는 쪽에서 lock 을 잡고 있음)
+        if version != self._version:
+            if self._entries:
+                metrics.inc("backend_cache_invalidations")
+            self._clear()
+            self._version = version
+
+    def get(self, key: str, version: str = "") -> Optional[Dict]:
+        now = time.monotonic()
+        with self._lock:
+            self._sync_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            metrics.inc("backend_cache_misses")
+            return None
+        metrics.inc("backend_cache_hits")
+        # 호출하는 쪽에서 응답을 고쳐도 캐시가 바뀌지 않도록 복사본을 돌려줌
+        return copy.deepcopy(entry[1])
+
+    def put(self, key: str, response, version: str = ""):
+        if not isinstance(response, dict) or response.get("error") or response.get("status") in ("accepted", "rejected"):
+            # 실패/비동기 접수 응답은 저장하지 않음
+            return
+        size = memory.sizeof(key) + memory.sizeof(response)
+        if size > self.max_bytes:
+            # 상한보다 큰 응답 하나 때문에 캐시 전체를 비우지 않음
+            return
+        with self._lock:
+            self._sync_version(version)
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(response), size)
+            self.bytes_used += size
+            while len(self._entries) > self.max_entries or self.bytes_used > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+            count, used = len(self._entries), self.bytes_used
+        metrics.set_gauge("backend_cache_entries", count)
+        metrics.set_gauge("backend_cache_bytes", used)
+
+    def purge(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._clear()
+        metrics.set_gauge("backend_cache_entries", 0)
+        metrics.set_gauge("backend_cache_bytes", 0)
+        return count
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self.bytes_used,
+                    "menu_version": self._version, "ttl": self.ttl}
+
+
+cache = ResponseCache()
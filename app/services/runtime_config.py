@@ -0,0 +1,220 @@
+import os
+import json
+import asyncio
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.services import metrics
+from app.services.intent_cache import fingerprint
+
+# 재시작 없이 바꿀 수 있는 설정 (config/ 디렉터리)
+# - prompts/system.txt: 시스템 프롬프트 (예시 전체 포함)
+# - prompts/core.txt, examples.jsonl: 적응형 프롬프트용 규칙 요약과 예시 저장소 (few_shot 참고)
+# - settings.json: 모델/temperature/프롬프트 모드 ("model" 이 없으면 OPENAI_MODEL 환경 변수 사용)
+# - menu.json: 추천 후보 계산용 메뉴 데이터 (MENU_DATA_PATH)
+# CONFIG_RELOAD_INTERVAL 마다 파일 변경을 확인해 새 스냅샷을 통째로 교체한다.
+# 요청은 시작할 때 잡은 스냅샷 하나만 끝까지 사용하므로 교체 도중에도 섞인 설정을 보지 않는다.
+# 파생 캐시는 자신에게 영향을 주는 부분의 fingerprint 로 키를 잡아 필요한 것만 무효화된다.
+# (프롬프트/모델 변경 → 인텐트 캐시 키 변경, 메뉴 변경 → 메뉴 필터 엔진만 재생성)
+CONFIG_DIR = os.getenv("CONFIG_DIR", str(Path(__file__).resolve().parents[2] / "config"))
+MENU_DATA_PATH = os.getenv("MENU_DATA_PATH", str(Path(CONFIG_DIR) / "menu.json"))
+CONFIG_RELOAD_INTERVAL = float(os.getenv("CONFIG_RELOAD_INTERVAL", 2))
+DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+DEFAULT_TEMPERATURE = 0.3
+DEFAULT_PROMPT_MODE = os.getenv("PROMPT_MODE", "full")
+DEFAULT_FEWSHOT_K = int(os.getenv("FEWSHOT_K", 4))
+
+
+class ConfigSnapshot:
+    def __init__(self, settings: Dict, system_prompt: str, menu: Optional[List[Dict]] = None, menu_version: str = "",
+                 core_prompt: str = "", examples: Optional[List[Dict]] = None, examples_version: str = ""):
+        self.label = str(settings.get("version", ""))
+        self.model = settings.get("model") or DEFAULT_MODEL
+        self.temperature = float(settings.get("temperature", DEFAULT_TEMPERATURE))
+        self.prompt_mode = settings.get("prompt_mode") or DEFAULT_PROMPT_MODE
+        self.fewshot_k = int(settings.get("fewshot_k", DEFAULT_FEWSHOT_K))
+        # 페이지별 단답 문법 (slot_parser 참고)
+        self.slot_pages: Dict[str, List[str]] = settings.get("slot_pages") or {}
+        # 고정 응답 템플릿 버전 (templates 참고)
+        self.template_version = str(settings.get("template_version", ""))
+        self.system_prompt = system_prompt
+        # 시스템 메시지는 요청마다 새로 만들지 않고 스냅샷 안의 같은 dict 를 재사용
+        self.system_message = {"role": "system", "content": system_prompt}
+        self.core_message = {"role": "system", "content": core_prompt}
+        # 인텐트 추출 결과에 영향을 주는 것만으로 만든 fingerprint (인텐트 캐시 키에 사용)
+        self.prompt_fingerprint = fingerprint(self.model, system_prompt, self.temperature)
+        self.adaptive_fingerprint = fingerprint(
+            self.model, core_prompt, self.temperature, examples_version, self.fewshot_k,
+        )
+        self.menu = menu
+        self.menu_version = menu_version
+        self.examples = examples or []
+        self.examples_version = examples_version
+        self.adaptive_available = bool(core_prompt and self.examples)
+        self.version = fingerprint(
+            self.label, self.prompt_fingerprint, self.adaptive_fingerprint, self.prompt_mode,
+            sorted(self.slot_pages.items()), self.template_version, menu_version,
+        )
+
+    def fingerprint_for(self, mode: str) -> str:
+        return self.adaptive_fingerprint if mode == "adaptive" else self.prompt_fingerprint
+
+    def page_label(self, page: str) -> str:
+        # 메트릭 라벨용 page: 클라이언트가 보낸 값이므로 slot_pages 에 등록된 페이지만 그대로, 나머지는 "other"
+        return page if page and page != "*" and page in self.slot_pages else "other"
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": self.version,
+            "label": self.label,
+            "model": self.model,
+            "temperature": self.temperature,
+            "prompt_fingerprint": self.prompt_fingerprint,
+            "prompt_chars": len(self.system_prompt),
+            "prompt_mode": self.prompt_mode,
+            "fewshot_k": self.fewshot_k,
+            "slot_pages": self.slot_pages,
+            "template_version": self.template_version,
+            "core_prompt_chars": len(self.core_message["content"]),
+            "examples": len(self.examples),
+            "examples_version": self.examples_version,
+            "menu_version": self.menu_version,
+            "menu_items": len(self.menu) if self.menu is not None else None,
+        }
+
+
+def check_settings(settings) -> Dict:
+    # 타입이 틀린 값은 스냅샷을 만들거나 요청을 처리할 때 터지므로 읽을 때 거름
+    if not isinstance(settings, dict):
+        raise ValueError("settings.json must be an object")
+    for key in ("model", "prompt_mode"):
+        if settings.get(key) is not None and not isinstance(settings[key], str):
+            raise ValueError(f"{key} must be a string")
+    if settings.get("prompt_mode") not in (None, "", "full", "adaptive"):
+        raise ValueError(f"unknown prompt_mode: {settings['prompt_mode']}")
+    for key in ("temperature", "fewshot_k"):
+        if key in settings and (isinstance(settings[key], bool) or not isinstance(settings[key], (int, float))):
+            raise ValueError(f"{key} must be a number")
+    slot_pages = settings.get("slot_pages")
+    if slot_pages is not None:
+        if not isinstance(slot_pages, dict):
+            raise ValueError("slot_pages must be an object")
+        for page, kinds in slot_pages.items():
+            if not isinstance(kinds, list) or not all(isinstance(kind, str) for kind in kinds):
+                raise ValueError(f"slot_pages[{page}] must be a list of strings")
+    return settings
+
+
+def check_examples(examples: List) -> List[Dict]:
+    for index, example in enumerate(examples):
+        if not isinstance(example, dict) or not isinstance(example.get("text"), str) or "output" not in example:
+            raise ValueError(f"examples.jsonl line {index + 1}: text and output are required")
+    return examples
+
+
+def check_menu(menu) -> List[Dict]:
+    # 메뉴 필터 엔진이 요청마다 실패하지 않도록 읽을 때 형식을 확인 (잘못되면 이전 설정 유지)
+    if not isinstance(menu, list):
+        raise ValueError("menu must be a list")
+    for index, item in enumerate(menu):
+        if not isinstance(item, dict) or not isinstance(item.get("name"), str) or not item["name"]:
+            raise ValueError(f"menu[{index}]: name is required")
+        price = item.get("price", 0)
+        if isinstance(price, bool) or not isinstance(price, (int, float)):
+            raise ValueError(f"menu[{index}]: price must be a number")
+        for key in ("tags", "ingredients"):
+            if not isinstance(item.get(key, []), list):
+                raise ValueError(f"menu[{index}]: {key} must be a list")
+    return menu
+
+
+class ConfigStore:
+    def __init__(self, config_dir: str = CONFIG_DIR, menu_path: str = MENU_DATA_PATH,
+                 interval: float = CONFIG_RELOAD_INTERVAL):
+        self.settings_path = Path(config_dir) / "settings.json"
+        self.prompt_path = Path(config_dir) / "prompts" / "system.txt"
+        self.core_path = Path(config_dir) / "prompts" / "core.txt"
+        self.examples_path = Path(config_dir) / "examples.jsonl"
+        self.menu_path = Path(menu_path)
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stamp = self._file_stamp()
+        self.current = self.load()
+
+    def _file_stamp(self):
+        stamp = []
+        for path in (self.settings_path, self.prompt_path, self.core_path, self.examples_path, self.menu_path):
+            try:
+                stat = path.stat()
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def load(self) -> ConfigSnapshot:
+        settings = {}
+        if self.settings_path.exists():
+            settings = check_settings(json.loads(self.settings_path.read_text(encoding="utf-8")))
+        system_prompt = self.prompt_path.read_text(encoding="utf-8").strip()
+        menu, menu_version = None, ""
+        if self.menu_path.exists():
+            raw = self.menu_path.read_text(encoding="utf-8")
+            data = json.loads(raw)
+            menu = check_menu(data["menu"] if isinstance(data, dict) else data)
+            menu_version = fingerprint(raw)
+        core_prompt = self.core_path.read_text(encoding="utf-8").strip() if self.core_path.exists() else ""
+        examples, examples_version = [], ""
+        if self.examples_path.exists():
+            raw = self.examples_path.read_text(encoding="utf-8")
+            examples = check_examples([json.loads(line) for line in raw.splitlines() if line.strip()])
+            examples_version = fingerprint(raw)
+        return ConfigSnapshot(settings, system_prompt, menu, menu_version, core_prompt, examples, examples_version)
+
+    def reload(self, force: bool = False) -> bool:
+        stamp = self._file_stamp()
+        if stamp == self._stamp and not force:
+            return False
+        self._stamp = stamp
+        try:
+            snapshot = self.load()
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # 편집 도중의 깨진 파일은 무시하고 이전 설정을 계속 사용
+            metrics.inc("config_reload_errors")
+            print("[설정 다시 읽기 실패]", e)
+            return False
+        if snapshot.version == self.current.version:
+            return False
+        previous, self.current = self.current, snapshot
+        metrics.inc("config_reloads")
+        print("[설정 변경]", previous.version, "→", snapshot.version, snapshot.label)
+        return True
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._watch())
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            # 파일 읽기/파싱은 이벤트 루프 밖에서
+            # 예상하지 못한 오류가 나도 감시는 계속 (태스크가 죽으면 다시 읽기가 조용히 멈춤)
+            try:
+                await asyncio.to_thread(self.reload)
+            except Exception as e:
+                metrics.inc("config_reload_errors")
+                print("[설정 다시 읽기 실패]", e)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+store = ConfigStore()
+
+
+def current() -> ConfigSnapshot:
+    return store.current
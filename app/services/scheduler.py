@@ -0,0 +1,161 @@
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from app.services import metrics
+
+# 모델 호출 동시성 스케줄러 (call_openai 앞단)
+# - 동시에 SCHEDULER_CONCURRENCY 개까지만 모델을 호출하고 나머지는 대기
+# - 대기 순서는 테넌트(매장) 단위 가중 공정 큐잉 (start-time fair queuing):
+#   테넌트마다 1/weight 만큼 가상 시간이 늘어나므로 바쁜 매장이 큐를 채워도 조용한 매장 요청이 앞에 끼어듦
+# - 지연 예산(deadline)까지 남은 시간이 예상 모델 응답 시간보다 작으면 공정 순서보다 먼저
+#   (이미 마감이 지난 요청은 제외하고, 마감 임박 요청끼리도 공정 순서 → 과부하로 모두 임박해도 FIFO 가 되지 않음)
+# - 테넌트는 TENANT_HEADER 헤더 값, 없으면 sessionId 의 TENANT_SEPARATOR 앞부분, 둘 다 없으면 DEFAULT_TENANT
+#   (sessionId 전체를 쓰면 매장이 아니라 세션 단위 공정성이 되므로)
+# - 테넌트 값은 클라이언트가 보내는 값이므로 메트릭 라벨에는 가중치에 등록된 매장만 쓰고 나머지는 "other"
+# - 대기열이 SCHEDULER_MAX_WAITING 개를 넘으면 기다리지 않고 SchedulerFull (모델이 멈춰도 대기자가 무한히 쌓이지 않도록)
+SCHEDULER_CONCURRENCY = int(os.getenv("SCHEDULER_CONCURRENCY", 16))
+SCHEDULER_MAX_WAITING = int(os.getenv("SCHEDULER_MAX_WAITING", 1000))
+LATENCY_BUDGET_MS = float(os.getenv("SCHEDULER_LATENCY_BUDGET_MS", 3000))
+TENANT_HEADER = os.getenv("TENANT_HEADER", "X-Store-Id")
+TENANT_SEPARATOR = os.getenv("TENANT_SEPARATOR", ":")
+DEFAULT_TENANT = "default"
+# 응답 시간 추정치(EWMA) 초기값과 반영 비율
+INITIAL_SERVICE_SECONDS = 1.0
+SERVICE_ALPHA = 0.2
+# 테넌트별 가상 종료 시각 테이블 상한 (헤더/sessionId 로 임의의 테넌트가 들어올 수 있으므로 LRU 로 제한)
+MAX_TRACKED_TENANTS = 1024
+
+
+def parse_weights(value: str) -> Dict[str, float]:
+    # "gangnam=3,hongdae=2" → {"gangnam": 3.0, "hongdae": 2.0}
+    weights = {}
+    for item in value.split(","):
+        if "=" in item:
+            tenant, weight = item.split("=", 1)
+            weights[tenant.strip()] = max(float(weight), 0.01)
+    return weights
+
+
+TENANT_WEIGHTS = parse_weights(os.getenv("SCHEDULER_TENANT_WEIGHTS", ""))
+
+
+def tenant_for(session_id: str, header: Optional[str] = None) -> str:
+    if header:
+        return header
+    if session_id and TENANT_SEPARATOR in session_id:
+        return session_id.split(TENANT_SEPARATOR, 1)[0] or DEFAULT_TENANT
+    return DEFAULT_TENANT
+
+
+def deadline_after(budget_ms: float = LATENCY_BUDGET_MS) -> float:
+    return time.monotonic() + budget_ms / 1000
+
+
+class SchedulerFull(Exception):
+    pass
+
+
+class _Waiter:
+    __slots__ = ("tenant", "tag", "deadline", "future")
+
+    def __init__(self, tenant: str, tag: float, deadline: float, future: asyncio.Future):
+        self.tenant = tenant
+        self.tag = tag
+        self.deadline = deadline
+        self.future = future
+
+
+class FairScheduler:
+    def __init__(self, concurrency: int = SCHEDULER_CONCURRENCY, weights: Optional[Dict[str, float]] = None,
+                 max_waiting: int = SCHEDULER_MAX_WAITING):
+        self.concurrency = concurrency
+        self.max_waiting = max_waiting
+        self.weights = TENANT_WEIGHTS if weights is None else weights
+        self.active = 0
+        self.virtual_time = 0.0
+        self.service_estimate = INITIAL_SERVICE_SECONDS
+        self._finish: "OrderedDict[str, float]" = OrderedDict()
+        self._waiting: List[_Waiter] = []
+
+    def _tag(self, tenant: str) -> float:
+        # 가상 시작 시각 = max(현재 가상 시간, 같은 테넌트 직전 요청의 가상 종료 시각)
+        start = max(self.virtual_time, self._finish.get(tenant, 0.0))
+        self._finish[tenant] = start + 1 / self.weights.get(tenant, 1.0)
+        self._finish.move_to_end(tenant)
+        if len(self._finish) > MAX_TRACKED_TENANTS:
+            # 가장 오래 요청이 없던 테넌트부터 잊음 (다시 오면 현재 가상 시간부터 시작)
+            self._finish.popitem(last=False)
+        return start
+
+    def _next(self) -> _Waiter:
+        # 대기열은 매장 수 × 키오스크 수 정도라 매번 선형 탐색
+        now = time.monotonic()
+        urgent = [w for w in self._waiting if 0 <= w.deadline - now <= self.service_estimate]
+        return min(urgent or self._waiting, key=lambda w: w.tag)
+
+    def _grant(self):
+        while self._waiting and self.active < self.concurrency:
+            waiter = self._next()
+            self._waiting.remove(waiter)
+            if waiter.future.done():
+                continue
+            self.active += 1
+            self.virtual_time = max(self.virtual_time, waiter.tag)
+            waiter.future.set_result(None)
+        metrics.set_gauge("scheduler_waiting", len(self._waiting))
+
+    def _release(self):
+        self.active -= 1
+        self._grant()
+
+    async def _acquire(self, tenant: str, deadline: float):
+        if len(self._waiting) >= self.max_waiting:
+            metrics.inc("scheduler_rejected", tenant=self.label_for(tenant))
+            raise SchedulerFull(f"scheduler queue full ({self.max_waiting} waiting)")
+        tag = self._tag(tenant)
+        if self.active < self.concurrency and not self._waiting:
+            self.active += 1
+            self.virtual_time = max(self.virtual_time, tag)
+            return
+        waiter = _Waiter(tenant, tag, deadline, asyncio.get_running_loop().create_future())
+        self._waiting.append(waiter)
+        metrics.set_gauge("scheduler_waiting", len(self._waiting))
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 자리를 받은 직후 취소됨 → 다음 대기자에게 넘김
+                self._release()
+            elif waiter in self._waiting:
+                self._waiting.remove(waiter)
+            raise
+
+    def label_for(self, tenant: str) -> str:
+        return tenant if tenant == DEFAULT_TENANT or tenant in self.weights else "other"
+
+    @asynccontextmanager
+    async def slot(self, tenant: str = DEFAULT_TENANT, deadline: Optional[float] = None):
+        if self.concurrency <= 0:
+            yield
+            return
+        deadline = deadline_after() if deadline is None else deadline
+        enqueued = time.monotonic()
+        await self._acquire(tenant, deadline)
+        started = time.monotonic()
+        label = self.label_for(tenant)
+        metrics.observe("scheduler_queue_seconds", started - enqueued, tenant=label)
+        if started > deadline:
+            metrics.inc("scheduler_deadline_missed", tenant=label)
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self.service_estimate += SERVICE_ALPHA * (elapsed - self.service_estimate)
+            self._release()
+
+
+scheduler = FairScheduler()
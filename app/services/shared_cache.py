@@ -0,0 +1,130 @@
+import os
+import mmap
+import time
+import struct
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows 등: 공유 계층 없이 동작 (INTENT_CACHE_SHARED 를 켜면 생성 시 OSError)
+    fcntl = None
+
+# 여러 uvicorn 워커가 같이 쓰는 공유 메모리 해시 테이블 (인텐트 캐시의 프로세스 간 계층)
+# - 파일(/dev/shm 권장)을 mmap 해서 모든 워커가 같은 메모리를 봄
+# - 고정 크기 슬롯을 WAYS 개씩 묶은 set-associative 구조: 키 해시로 set 을 고르고 그 안에서만 찾음
+#   set 이 가득 차면 가장 오래 전에 쓴 슬롯을 덮어씀
+# - 읽기는 잠금 없이 seqlock 으로: 슬롯 seq 가 홀수면 쓰는 중, 읽기 전후 seq 가 다르면 다시 읽음
+# - 쓰기는 set 단위 fcntl 바이트 범위 잠금(프로세스 간) + 프로세스 안 스레드 잠금
+#   (서로 다른 set 에 쓰는 워커끼리는 기다리지 않음)
+# - 파일 이름에 크기 설정(슬롯 수 x 슬롯 크기 x ways)을 붙여, 설정이 다른 워커는 다른 파일을 씀
+#   (다른 워커가 mmap 중인 파일을 줄이면 SIGBUS 가 나므로 이미 만들어진 파일은 절대 자르지 않음)
+MAGIC = b"NLPSHM01"
+_HEADER = struct.Struct("<8sIII")
+HEADER_BYTES = 64
+# seq, 마지막 쓰기 시각(ns), 키 digest, 값 길이
+_SLOT = struct.Struct("<IQ16sI")
+_SEQ = struct.Struct("<I")
+READ_RETRIES = 8
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+class SharedTable:
+    def __init__(self, path: str, slots: int = 16384, slot_bytes: int = 2048, ways: int = 4):
+        self.ways = ways
+        self.sets = max(slots // ways, 1)
+        self.slots = self.sets * ways
+        self.slot_bytes = slot_bytes
+        self.capacity = slot_bytes - _SLOT.size
+        self.set_bytes = slot_bytes * ways
+        size = HEADER_BYTES + self.slots * slot_bytes
+        if fcntl is None:
+            raise OSError("shared cache requires fcntl (POSIX)")
+
+        self.path = f"{path}-{self.slots}x{slot_bytes}x{ways}"
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._write_lock = threading.Lock()
+        # 여러 워커가 동시에 시작해도 한 번만 초기화되도록 헤더 범위를 잠그고 확인
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, HEADER_BYTES, 0)
+        try:
+            expected = _HEADER.pack(MAGIC, self.slots, slot_bytes, ways)
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, expected, 0)
+            elif os.pread(self._fd, _HEADER.size, 0) != expected or os.fstat(self._fd).st_size != size:
+                raise ValueError(f"shared cache file {self.path} has an unexpected layout")
+            self._map = mmap.mmap(self._fd, size)
+        except BaseException:
+            # 닫으면 잠금도 함께 풀림
+            os.close(self._fd)
+            raise
+        fcntl.lockf(self._fd, fcntl.LOCK_UN, HEADER_BYTES, 0)
+
+    def _set_offset(self, digest: bytes) -> int:
+        return HEADER_BYTES + (int.from_bytes(digest[:8], "little") % self.sets) * self.set_bytes
+
+    def get(self, key: str) -> Optional[str]:
+        digest = _digest(key)
+        base = self._set_offset(digest)
+        for way in range(self.ways):
+            offset = base + way * self.slot_bytes
+            for _ in range(READ_RETRIES):
+                seq, _, slot_key, length = _SLOT.unpack_from(self._map, offset)
+                if seq & 1:
+                    continue
+                if slot_key != digest or length > self.capacity:
+                    break
+                value = self._map[offset + _SLOT.size:offset + _SLOT.size + length]
+                if _SEQ.unpack_from(self._map, offset)[0] == seq:
+                    return value.decode("utf-8")
+        return None
+
+    def put(self, key: str, value: str) -> bool:
+        data = value.encode("utf-8")
+        if len(data) > self.capacity:
+            return False
+        digest = _digest(key)
+        base = self._set_offset(digest)
+        with self._write_lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, self.set_bytes, base)
+            try:
+                offset = self._victim(base, digest)
+                seq = _SEQ.unpack_from(self._map, offset)[0]
+                _SEQ.pack_into(self._map, offset, seq + 1)
+                self._map[offset + _SLOT.size:offset + _SLOT.size + len(data)] = data
+                _SLOT.pack_into(self._map, offset, seq + 1, time.time_ns(), digest, len(data))
+                _SEQ.pack_into(self._map, offset, seq + 2)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, self.set_bytes, base)
+        return True
+
+    def _victim(self, base: int, digest: bytes) -> int:
+        # 같은 키 → 빈 슬롯 → 가장 오래 전에 쓴 슬롯 순
+        oldest, oldest_written = base, None
+        for way in range(self.ways):
+            offset = base + way * self.slot_bytes
+            _, written, slot_key, _ = _SLOT.unpack_from(self._map, offset)
+            if slot_key == digest or written == 0:
+                return offset
+            if oldest_written is None or written < oldest_written:
+                oldest, oldest_written = offset, written
+        return oldest
+
+    def clear(self):
+        with self._write_lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                self._map[HEADER_BYTES:] = bytes(len(self._map) - HEADER_BYTES)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
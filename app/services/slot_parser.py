@@ -0,0 +1,110 @@
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+from app.services import metrics, normalize
+from app.services.runtime_config import ConfigSnapshot
+
+# 옵션 질문에 대한 단답("M", "아이스로요", "샷 추가", "좋아")을 모델 없이 처리하는 페이지별 문법
+# - 정규화된 발화 전체가 아래 표의 값/채움말로만 이루어져 있을 때만 처리하고, 하나라도 모르는 말이 있으면
+#   None 을 돌려 모델에 맡긴다 (메뉴 이름, "M을"처럼 기존 옵션을 가리키는 조사 등)
+# - 페이지마다 받을 슬롯 종류는 settings.json 의 slot_pages 로 지정 ({"<page>": ["size", ...], "*": 기본값})
+#   등록하지 않은 페이지는 처리하지 않음 ("네", "보통" 같은 말이 옵션을 묻지 않는 화면에서 모델을 건너뛰지 않도록)
+# - 페이지별로 전체 턴 중 로컬에서 처리한 비율을 slot_parser_coverage 게이지로 기록
+#   (page 는 클라이언트가 보낸 값이므로 slot_pages 에 등록된 페이지만 라벨로 쓰고 나머지는 "other")
+SLOT_PARSER_ENABLED = os.getenv("SLOT_PARSER_ENABLED", "true").lower() != "false"
+SLOT_KINDS = ["size", "temperature", "shot", "action"]
+
+# 값 표현 → (슬롯, 값). 수사/사이즈 동의어/높임 어미는 normalize 에서 이미 통일됨
+VALUES: Dict[str, tuple] = {
+    "S": ("size", "S"), "M": ("size", "M"), "L": ("size", "L"),
+    "작은 거": ("size", "S"), "중간 거": ("size", "M"), "큰 거": ("size", "L"),
+    "아이스": ("temperature", "아이스"), "차갑게": ("temperature", "아이스"), "시원하게": ("temperature", "아이스"),
+    "차가운 거": ("temperature", "아이스"), "시원한 거": ("temperature", "아이스"),
+    "핫": ("temperature", "핫"), "뜨겁게": ("temperature", "핫"), "따뜻하게": ("temperature", "핫"),
+    "따듯하게": ("temperature", "핫"), "뜨거운 거": ("temperature", "핫"), "따뜻한 거": ("temperature", "핫"),
+    # 메뉴 없이 말한 샷 표현은 프롬프트 규칙대로 샷 강도(options.shot)로 처리
+    # ("2샷 추가"처럼 음료/커피에 따라 필드가 달라지는 표현은 모델에 맡김)
+    "샷 추가": ("shot", "진하게"), "1샷 추가": ("shot", "진하게"), "샷 1개 추가": ("shot", "진하게"),
+    "진하게": ("shot", "진하게"), "강하게": ("shot", "진하게"),
+    "연하게": ("shot", "연하게"), "약하게": ("shot", "연하게"), "샷 빼줘": ("shot", "연하게"),
+    "보통": ("shot", "보통"), "기본": ("shot", "보통"),
+    "싫어": ("action", "reject"), "아니야": ("action", "reject"), "아니": ("action", "reject"),
+    "아뇨": ("action", "reject"),
+    "다른 거": ("action", "retry"), "다른 걸로": ("action", "retry"), "그건 말고": ("action", "retry"),
+    "좋아": ("action", "accept"), "응": ("action", "accept"), "네": ("action", "accept"),
+    "예": ("action", "accept"), "그래": ("action", "accept"),
+}
+# 값 뒤에 붙어도 되는 말 ("M으로", "M사이즈로", "아이스요")
+SUFFIXES = ["사이즈로", "사이즈요", "사이즈", "으로", "로", "요"]
+# 값 사이/앞뒤에 와도 의미가 바뀌지 않는 말
+FILLERS = [
+    "사이즈", "사이즈는", "사이즈를", "사이즈로", "사이즈요", "온도", "온도는", "온도를", "샷은", "옵션은",
+    "그리고", "하고", "바꾸고", "해줘", "해", "줘", "바꿔줘", "변경해줘", "할게", "할래", "부탁해",
+]
+
+
+def _alternation(words) -> str:
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+_TOKEN = re.compile(
+    r"(?:(?P<value>" + _alternation(VALUES) + r")(?:" + _alternation(SUFFIXES) + r")?"
+    r"|(?P<filler>" + _alternation(FILLERS) + r"))(?=$|[\s,])[\s,]*"
+)
+
+_lock = threading.Lock()
+_counts: Dict[str, List[int]] = {}
+
+
+def _slots(text: str) -> Optional[Dict[str, str]]:
+    slots: Dict[str, str] = {}
+    position = 0
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            return None
+        position = match.end()
+        if match.group("value"):
+            kind, value = VALUES[match.group("value")]
+            if slots.get(kind, value) != value:
+                return None
+            slots[kind] = value
+    return slots or None
+
+
+def allowed_kinds(page: str, config: ConfigSnapshot) -> List[str]:
+    pages = config.slot_pages
+    return pages.get(page or "", pages.get("*", []))
+
+
+def parse_slots(text: str, kinds: List[str] = SLOT_KINDS) -> Optional[Dict]:
+    slots = _slots(normalize.normalize(text))
+    if slots is None or any(kind not in kinds for kind in slots):
+        return None
+    if "action" in slots:
+        # 수락/거절/재시도는 옵션과 같이 오면 모호하므로 단독일 때만
+        return {"intents": None, "action": slots["action"]} if len(slots) == 1 else None
+    return {"intents": ["order.update"], "items": [{"options": slots}], "filters": {}}
+
+
+def _count(page: str, handled: bool):
+    with _lock:
+        counts = _counts.setdefault(page, [0, 0])
+        counts[0] += handled
+        counts[1] += 1
+        coverage = counts[0] / counts[1]
+    metrics.inc("slot_parser_turns", page=page)
+    if handled:
+        metrics.inc("slot_parser_local", page=page)
+    metrics.set_gauge("slot_parser_coverage", round(coverage, 4), page=page)
+
+
+def parse(text: str, page: str, config: ConfigSnapshot) -> Optional[Dict]:
+    if not SLOT_PARSER_ENABLED:
+        return None
+    result = parse_slots(text, allowed_kinds(page, config))
+    _count(config.page_label(page), result is not None)
+    return result
+
@@ -0,0 +1,89 @@
+import os
+import copy
+import threading
+from typing import Dict, Optional
+
+from app.services import intent_plan, memory, metrics
+from app.services.runtime_config import ConfigSnapshot
+
+# 고정 응답 인텐트(help / error / exit) 템플릿
+# 백엔드가 이 인텐트들에 돌려주는 응답은 세션과 무관하고 page 에 따라서만 달라지므로,
+# (인텐트, page) 별로 처음 받은 백엔드 응답을 템플릿으로 저장해 두고 이후에는 백엔드를 거치지 않고 바로 돌려준다.
+# - 버전: settings.json 의 template_version 이 바뀌면(백엔드 문구 변경 배포 등) 이전 템플릿은 모두 무효
+# - 상태를 바꾸는 인텐트(exit)는 응답만 템플릿으로 주고 백엔드 전달은 비동기 큐로 (세션 초기화는 그대로 반영)
+#   응답 직후 다음 요청과 순서가 섞일 수 있으므로 TEMPLATE_INTENTS 에 명시했을 때만 사용
+# - 관리자 API (DELETE /admin/templates)로 즉시 비울 수 있음
+TEMPLATE_INTENTS = {
+    intent for intent in os.getenv("TEMPLATE_INTENTS", "help,error").split(",") if intent
+}
+MAX_TEMPLATES = 1000
+# 템플릿 수는 인텐트 × page 로 작지만 응답 크기는 백엔드가 정하므로 전체 크기(memory.sizeof 추정치)도 제한
+TEMPLATE_MAX_BYTES = int(os.getenv("TEMPLATE_MAX_BYTES", 1024 * 1024))
+# 이 필드들에 값이 있으면 발화 내용에 따라 응답이 달라질 수 있으므로 템플릿 대상이 아님
+_CONTENT_FIELDS = ("items", "categories", "filters", "target", "action")
+
+
+def template_key(intent_result: Dict, page: str) -> Optional[str]:
+    intents = intent_result.get("intents") or []
+    if len(intents) != 1 or intents[0] not in TEMPLATE_INTENTS:
+        return None
+    if any(intent_result.get(field) for field in _CONTENT_FIELDS):
+        return None
+    return f"{intents[0]}|{page or ''}"
+
+
+def needs_delivery(intent_result: Dict) -> bool:
+    return intent_plan.writes_state(intent_result["intents"][0])
+
+
+class TemplateStore:
+    def __init__(self, max_entries: int = MAX_TEMPLATES, max_bytes: int = TEMPLATE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self._lock = threading.Lock()
+        # key -> (template_version, 응답, 추정 크기)
+        self._templates: Dict[str, tuple] = {}
+
+    def get(self, key: str, config: ConfigSnapshot) -> Optional[Dict]:
+        with self._lock:
+            entry = self._templates.get(key)
+        if entry is None or entry[0] != config.template_version:
+            metrics.inc("template_misses")
+            return None
+        metrics.inc("template_hits", intent=key.split("|", 1)[0])
+        # 호출하는 쪽에서 응답을 고쳐도 템플릿이 바뀌지 않도록 복사본을 돌려줌
+        return copy.deepcopy(entry[1])
+
+    def put(self, key: str, config: ConfigSnapshot, response):
+        if not isinstance(response, dict) or response.get("error") or response.get("status") in ("accepted", "rejected"):
+            # 실패/비동기 접수 응답은 템플릿으로 쓰지 않음
+            return
+        size = memory.sizeof(key) + memory.sizeof(response)
+        with self._lock:
+            previous = self._templates.get(key)
+            used = self.bytes_used - (previous[2] if previous else 0) + size
+            if previous is None and len(self._templates) >= self.max_entries or used > self.max_bytes:
+                # 가득 차면 새 템플릿은 저장하지 않고 백엔드로 보냄 (버전이 바뀌면 덮어쓰며 자리가 생김)
+                metrics.inc("template_rejected")
+                return
+            self._templates[key] = (config.template_version, copy.deepcopy(response), size)
+            self.bytes_used = used
+        metrics.set_gauge("templates", len(self._templates))
+        metrics.set_gauge("template_bytes", used)
+
+    def purge(self) -> int:
+        with self._lock:
+            count = len(self._templates)
+            self._templates.clear()
+            self.bytes_used = 0
+        metrics.set_gauge("templates", 0)
+        metrics.set_gauge("template_bytes", 0)
+        return count
+
+    def entries(self) -> Dict[str, str]:
+        with self._lock:
+            return {key: version for key, (version, _, _) in self._templates.items()}
+
+
+store = TemplateStore()
@@ -0,0 +1,268 @@
+import os
+import sys
+import json
+import time
+import queue
+import threading
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from app.services import metrics
+
+# 모델 호출별 토큰 사용량 집계 / 일일 예산 관리
+# - 요청마다 (page, intent) 별로 prompt/completion/cached 토큰과 지연 시간을 기록
+# - 기록은 USAGE_LOG_PATH 에 JSONL 로 남기고, `python -m app.services.usage` 로 리포트를 출력
+# - 오늘 사용한 토큰이 TOKEN_BUDGET_DAILY 를 넘으면 OPENAI_BUDGET_MODEL 로 라우팅하고,
+#   OPENAI_BUDGET_PROMPT_MODE=adaptive 이면 프롬프트도 적응형(few_shot)으로 줄임
+# - 로그 쓰기와 (하루 한 번) 오늘 사용량 읽기는 쓰기 스레드에서 (이벤트 루프를 막지 않도록)
+#   오늘 사용량은 메모리에서 바로 누적하고, 로그에서 읽은 재시작 이전 사용량은 읽히는 대로 더해짐
+# - 메트릭의 page 라벨은 호출하는 쪽이 넘긴 (settings.json 에 등록된) 라벨만 사용 (기본 "other")
+USAGE_LOG_PATH = os.getenv(
+    "USAGE_LOG_PATH",
+    str(Path(__file__).resolve().parents[2] / ".cache" / "usage.jsonl"),
+)
+TOKEN_BUDGET_DAILY = int(os.getenv("TOKEN_BUDGET_DAILY", 0))
+BUDGET_MODEL = os.getenv("OPENAI_BUDGET_MODEL", "")
+BUDGET_PROMPT_MODE = os.getenv("OPENAI_BUDGET_PROMPT_MODE", "adaptive")
+
+# 1M 토큰당 USD (기본값: gpt-4o-mini)
+PRICE_INPUT = float(os.getenv("OPENAI_PRICE_INPUT", 0.15))
+PRICE_CACHED = float(os.getenv("OPENAI_PRICE_CACHED", 0.075))
+PRICE_OUTPUT = float(os.getenv("OPENAI_PRICE_OUTPUT", 0.60))
+TAIL_BLOCK_BYTES = 64 * 1024
+# 쓰기 대기열 상한 (디스크가 막혀도 메모리가 늘지 않도록, 넘으면 로그 한 줄을 버림)
+USAGE_QUEUE_MAX = int(os.getenv("USAGE_QUEUE_MAX", 10000))
+
+
+def cost(prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    uncached = max(prompt_tokens - cached_tokens, 0)
+    return (uncached * PRICE_INPUT + cached_tokens * PRICE_CACHED + completion_tokens * PRICE_OUTPUT) / 1_000_000
+
+
+def usage_tokens(usage) -> Dict[str, int]:
+    # OpenAI 응답의 usage 객체(또는 dict)에서 토큰 수만 꺼냄
+    if usage is None:
+        return {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+    get = usage.get if isinstance(usage, dict) else lambda key: getattr(usage, key, None)
+    details = get("prompt_tokens_details")
+    if isinstance(details, dict):
+        cached = details.get("cached_tokens")
+    else:
+        cached = getattr(details, "cached_tokens", None)
+    return {
+        "prompt_tokens": get("prompt_tokens") or 0,
+        "completion_tokens": get("completion_tokens") or 0,
+        "cached_tokens": cached or 0,
+    }
+
+
+class UsageTracker:
+    def __init__(self, path: str, daily_budget: int = 0, queue_max: int = USAGE_QUEUE_MAX):
+        self.path = path
+        self.daily_budget = daily_budget
+        self._lock = threading.Lock()
+        self._day: Optional[str] = None
+        self._day_tokens = 0
+        self._file = None
+        self._writes: "queue.Queue" = queue.Queue(maxsize=queue_max)
+        self._writer: Optional[threading.Thread] = None
+        # 마지막 호출의 토큰 사용량 (평가 러너에서 사용)
+        self.last: Optional[Dict[str, int]] = None
+
+    def _roll_day(self):
+        # lock 을 잡은 상태에서 호출
+        today = date.today().isoformat()
+        if self._day == today:
+            return
+        # 재시작 직후에도 예산이 이어지도록 오늘 기록을 로그 끝에서부터 합산 (하루에 한 번, 쓰기 스레드에서)
+        # 이후에는 record() 에서 누적. 읽기 요청이 오늘 기록보다 먼저 큐에 들어가므로 중복 합산되지 않음
+        self._day = today
+        self._day_tokens = 0
+        self._enqueue(("load", today))
+
+    def record(self, page: str, intents: Iterable[str], model: str, tokens: Dict[str, int], latency: float,
+               label: str = "other"):
+        entry = {
+            "ts": round(time.time(), 3),
+            "day": date.today().isoformat(),
+            "page": page or "",
+            "intents": list(intents or []),
+            "model": model,
+            "latency_ms": round(latency * 1000, 1),
+            **tokens,
+        }
+        total = entry["prompt_tokens"] + entry["completion_tokens"]
+        self.last = tokens
+        for intent in entry["intents"] or ["none"]:
+            metrics.inc("openai_prompt_tokens", entry["prompt_tokens"], page=label, intent=intent)
+            metrics.inc("openai_completion_tokens", entry["completion_tokens"], page=label, intent=intent)
+            metrics.inc("openai_cached_tokens", entry["cached_tokens"], page=label, intent=intent)
+
+        with self._lock:
+            self._roll_day()
+            self._day_tokens += total
+            self._enqueue(("entry", entry))
+
+    def _enqueue(self, op):
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+        try:
+            self._writes.put_nowait(op)
+        except queue.Full:
+            metrics.inc("usage_log_dropped")
+
+    def _write_loop(self):
+        while True:
+            kind, value = self._writes.get()
+            try:
+                if kind == "load":
+                    loaded = day_tokens(self.path, value)
+                    with self._lock:
+                        if self._day == value:
+                            self._day_tokens += loaded
+                else:
+                    if self._file is None:
+                        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                        self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+                    self._file.write(json.dumps(value, ensure_ascii=False) + "\n")
+            except OSError as e:
+                print("[사용량 로그 쓰기 실패]", e)
+            finally:
+                self._writes.task_done()
+
+    def over_budget(self) -> bool:
+        if self.daily_budget <= 0:
+            return False
+        with self._lock:
+            self._roll_day()
+            return self._day_tokens >= self.daily_budget
+
+    def choose_model(self, model: str) -> str:
+        if BUDGET_MODEL and self.over_budget():
+            metrics.inc("openai_budget_routed")
+            return BUDGET_MODEL
+        return model
+
+    def flush(self):
+        # 대기 중인 로그 쓰기/오늘 사용량 읽기가 끝날 때까지 기다림
+        if self._writer is not None and self._writer.is_alive():
+            self._writes.join()
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _parse(line) -> Optional[Dict]:
+    # 쓰는 도중 종료되어 잘린 줄 등은 건너뜀
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def read_log(path: str) -> List[Dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [entry for entry in map(_parse, f) if entry is not None]
+
+
+def _reverse_lines(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        rest = b""
+        while position > 0:
+            size = min(TAIL_BLOCK_BYTES, position)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + rest).split(b"\n")
+            # 맨 앞 줄은 이전 블록과 이어질 수 있으므로 다음 블록에서 처리
+            rest = lines.pop(0)
+            yield from reversed(lines)
+        yield rest
+
+
+def day_tokens(path: str, day: str) -> int:
+    # 로그는 시간 순으로 쌓이므로 끝에서부터 읽다가 이전 날짜가 나오면 멈춤 (파일 크기와 무관)
+    if not os.path.exists(path):
+        return 0
+    total = 0
+    for line in _reverse_lines(path):
+        entry = _parse(line) if line.strip() else None
+        if entry is None:
+            continue
+        if entry.get("day", "") < day:
+            break
+        if entry.get("day") == day:
+            total += (entry.get("prompt_tokens") or 0) + (entry.get("completion_tokens") or 0)
+    return total
+
+
+def _correlation(xs: List[float], ys: List[float]) -> Optional[float]:
+    n = len(xs)
+    if n < 2:
+        return None
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    var_y = sum((y - mean_y) ** 2 for y in ys)
+    if var_x == 0 or var_y == 0:
+        return None
+    return cov / (var_x * var_y) ** 0.5
+
+
+def summarize(entries: List[Dict], by: str = "page") -> Dict[str, Dict]:
+    groups = defaultdict(list)
+    for entry in entries:
+        if by == "intent":
+            keys = entry["intents"] or ["none"]
+        else:
+            keys = [entry.get(by) or "-"]
+        for key in keys:
+            groups[key].append(entry)
+
+    summary = {}
+    for key, rows in sorted(groups.items()):
+        latencies = sorted(row["latency_ms"] for row in rows)
+        summary[key] = {
+            "requests": len(rows),
+            "prompt_tokens": sum(row["prompt_tokens"] for row in rows),
+            "completion_tokens": sum(row["completion_tokens"] for row in rows),
+            "cached_tokens": sum(row["cached_tokens"] for row in rows),
+            "cost_usd": round(sum(cost(row["prompt_tokens"], row["completion_tokens"], row["cached_tokens"])
+                                  for row in rows), 6),
+            "p50_ms": latencies[len(latencies) // 2],
+            "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            "tokens_latency_corr": _correlation(
+                [row["prompt_tokens"] + row["completion_tokens"] for row in rows],
+                [row["latency_ms"] for row in rows],
+            ),
+        }
+    return summary
+
+
+def print_report(entries: List[Dict], out=sys.stdout):
+    for by in ("page", "intent", "model", "day"):
+        print(f"\n[{by}]", file=out)
+        print(f"{'key':<20}{'reqs':>8}{'prompt':>12}{'compl':>10}{'cached':>10}{'cost($)':>12}"
+              f"{'p50ms':>9}{'p95ms':>9}{'corr':>7}", file=out)
+        for key, row in summarize(entries, by).items():
+            corr = "-" if row["tokens_latency_corr"] is None else f"{row['tokens_latency_corr']:.2f}"
+            print(f"{key:<20}{row['requests']:>8}{row['prompt_tokens']:>12}{row['completion_tokens']:>10}"
+                  f"{row['cached_tokens']:>10}{row['cost_usd']:>12.4f}{row['p50_ms']:>9.0f}{row['p95_ms']:>9.0f}"
+                  f"{corr:>7}", file=out)
+
+
+tracker = UsageTracker(USAGE_LOG_PATH, TOKEN_BUDGET_DAILY)
+
+
+if __name__ == "__main__":
+    # python -m app.services.usage [usage.jsonl]
+    print_report(read_log(sys.argv[1] if len(sys.argv) > 1 else USAGE_LOG_PATH))
@@ -0,0 +1,341 @@
+import sys
+import json
+import random
+import argparse
+import itertools
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from app.services import normalize, runtime_config, slot_parser
+
+# 부하/정확도 측정용 합성 발화 생성기
+# SYSTEM_PROMPT 의 규칙대로 메뉴 이름, 수량, 옵션, 카테고리, 필터를 조합해 발화와 기대 JSON 을 함께 만든다.
+# - 종류: order(담기/담고 결제), change(옵션 변경/메뉴 교체/삭제/옵션 단답), recommend, confirm
+# - 서로 다른 발화 풀을 먼저 만들고, 풀 안에서 Zipf 분포로 뽑아 실제 트래픽처럼 같은 발화가 반복되게 함
+# - 출력은 골든 코퍼스와 같은 {"text", "expected"} 에 page, kind 를 더한 JSONL
+#   (intent_eval --corpus 로 정확도 채점, soak_memory --corpus 로 재생)
+#
+#   python -m app.services.utterance_gen --count 100000 --unique 5000 --zipf 1.1 --out traffic.jsonl
+#   python -m app.services.utterance_gen --unique 500 --distinct --out eval.jsonl   # 발화마다 한 번씩 (채점용)
+DEFAULT_MIX = {"order": 4, "change": 2, "recommend": 2, "confirm": 2}
+ALL_CATEGORIES = ["커피", "음료", "디저트", "디카페인"]
+DRINKS = ["커피", "음료", "디카페인"]
+
+# 메뉴 데이터(config/menu.json)가 없을 때 쓰는 기본 메뉴
+DEFAULT_MENU = [
+    {"name": name, "category": category}
+    for category, names in {
+        "커피": ["아메리카노", "카페라떼", "카푸치노", "바닐라라떼", "카라멜마끼아또", "콜드브루", "에스프레소"],
+        "음료": ["초코라떼", "아이스티", "녹차라떼", "레몬에이드", "딸기 스무디", "자바칩 프라푸치노", "밀크티"],
+        "디저트": ["치즈케이크", "초코쿠키", "크루아상", "티라미수", "마카롱", "베이글"],
+        "디카페인": ["디카페인 아메리카노", "디카페인 카페라떼", "디카페인 바닐라라떼"],
+    }.items()
+    for name in names
+]
+
+# 수량 표현 (잔은 음료류에만)
+QUANTITIES = [(1, "하나"), (1, "한 {unit}"), (1, "1{unit}"), (2, "두 {unit}"), (2, "2{unit}"), (3, "세 {unit}"), (3, "3{unit}")]
+ADD_VERBS = ["주세요", "담아줘", "주문할게", "추가해줘", "줘"]
+DELETE_VERBS = ["빼줘", "삭제해줘", "없애줘"]
+SIZES = ["S", "M", "L"]
+TEMPERATURES = [("아이스", "아이스"), ("시원한", "아이스"), ("따뜻한", "핫"), ("뜨거운", "핫"), ("핫", "핫")]
+TEMPERATURE_CHANGES = [("아이스로", "아이스"), ("차갑게", "아이스"), ("따뜻하게", "핫"), ("뜨겁게", "핫")]
+COFFEE_SHOTS = [("샷 추가해줘", "진하게"), ("진하게 해줘", "진하게"), ("연하게 해줘", "연하게"), ("샷 빼줘", "연하게")]
+DRINK_SHOTS = [("샷 하나 넣어줘", "1샷 추가"), ("샷 두 개 추가해줘", "2샷 추가")]
+BARE_OPTIONS = [
+    ("S", {"size": "S"}), ("M", {"size": "M"}), ("L", {"size": "L"}), ("M으로", {"size": "M"}),
+    ("L 사이즈로", {"size": "L"}), ("S로요", {"size": "S"}), ("아이스", {"temperature": "아이스"}),
+    ("아이스로요", {"temperature": "아이스"}), ("따뜻하게", {"temperature": "핫"}), ("뜨겁게 해줘", {"temperature": "핫"}),
+    ("샷 추가", {"shot": "진하게"}), ("연하게", {"shot": "연하게"}), ("M 사이즈 아이스로", {"size": "M", "temperature": "아이스"}),
+]
+# 날씨/기분 표현 → 태그 (프롬프트의 filters 규칙)
+MOODS = [
+    ("비 오는 날 어울리는 거", ["warm", "nutty", "sweet"]),
+    ("더운데 마실 만한 거", ["cold", "refresh", "zero"]),
+    ("추운 날 먹을 거", ["warm", "hot", "sweet"]),
+    ("피곤한데 힘 나는 거", ["creamy", "nutty", "warm"]),
+    ("기분 좋은 날 어울리는 거", ["sweet", "fruity", "popular"]),
+    ("집중할 때 좋은 거", ["bitter", "nutty", "hot"]),
+]
+TASTES = [("달달한 거", "sweet"), ("인기 있는 거", "popular"), ("새로 나온 거", "new"), ("상큼한 거", "fruity"),
+          ("고소한 거", "nutty"), ("씁쓸한 거", "bitter")]
+PRICES = [2000, 3000, 4000, 5000]
+CONFIRM_TARGETS = [
+    ("장바구니 보여줘", "cart"), ("장바구니에 뭐 있어?", "cart"), ("주문 내역 확인해줘", "order"),
+    ("내가 뭐 주문했지?", "order"), ("얼마야?", "price"), ("총 얼마예요?", "price"),
+]
+PAGES = {"order": "menu", "change": "cart", "recommend": "main", "confirm": "main"}
+
+
+def _batchim(word: str) -> Optional[int]:
+    # 마지막 글자의 받침 번호 (0: 없음). 알파벳은 읽는 소리 기준 (S 에스, M 엠, L 엘)
+    last = word.rstrip()[-1]
+    if "가" <= last <= "힣":
+        return (ord(last) - ord("가")) % 28
+    return {"M": 16, "L": 8}.get(last.upper(), 0)
+
+
+def josa(word: str, with_batchim: str, without: str) -> str:
+    # 을/를, 이/가, 으로/로 (ㄹ 받침 뒤에는 "로")
+    code = _batchim(word)
+    if with_batchim == "으로":
+        return word + ("으로" if code and code != 8 else "로")
+    return word + (with_batchim if code else without)
+
+
+def load_menu(path: Optional[str] = None) -> List[Dict]:
+    if path is None:
+        return DEFAULT_MENU
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    menu = data["menu"] if isinstance(data, dict) else data
+    return [{"name": item["name"], "category": item.get("category", "")} for item in menu]
+
+
+class UtteranceGenerator:
+    def __init__(self, menu: List[Dict] = DEFAULT_MENU, mix: Dict[str, float] = DEFAULT_MIX, seed: int = 0):
+        self.rng = random.Random(seed)
+        self.menu = menu
+        self.drinks = [item for item in menu if item["category"] in DRINKS]
+        self.categories = sorted({item["category"] for item in menu if item["category"] in ALL_CATEGORIES})
+        self.kinds = [kind for kind in mix if mix[kind] > 0]
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.makers = {
+            "order": [self._add, self._add, self._add_many, self._add_and_pay],
+            "change": [self._update, self._update, self._shot, self._replace, self._delete, self._bare_option],
+            "recommend": [self._recommend_category, self._recommend_count, self._recommend_mood,
+                          self._recommend_taste, self._recommend_price],
+            "confirm": [self._confirm_target, self._confirm_category, self._confirm_item],
+        }
+
+    # ---- 항목 ----
+    def _item(self) -> Tuple[str, Dict, str]:
+        # (발화 조각, 기대 item, 수량 단위). 음료류에만 온도/사이즈를 붙임
+        entry = self.rng.choice(self.menu)
+        item: Dict = {"name": entry["name"]}
+        words = [entry["name"]]
+        if entry["category"] not in DRINKS:
+            return entry["name"], item, "개"
+        options = {}
+        if "아이스" not in entry["name"] and self.rng.random() < 0.4:
+            word, value = self.rng.choice(TEMPERATURES)
+            words.insert(0, word)
+            options["temperature"] = value
+        if self.rng.random() < 0.3:
+            size = self.rng.choice(SIZES)
+            words.insert(0, f"{size} 사이즈")
+            options["size"] = size
+        if options:
+            item["options"] = options
+        return " ".join(words), item, self.rng.choice(["잔", "개"])
+
+    def _quantity(self, unit: str) -> Tuple[int, str]:
+        count, word = self.rng.choice(QUANTITIES)
+        return count, word.format(unit=unit)
+
+    # ---- order ----
+    def _add(self):
+        phrase, item, unit = self._item()
+        count, quantity = self._quantity(unit)
+        text = f"{phrase} {quantity} {self.rng.choice(ADD_VERBS)}"
+        return text, {"intents": ["order.add"], "items": [item] * count, "filters": {}}
+
+    def _add_many(self):
+        first, first_item, first_unit = self._item()
+        second, second_item, second_unit = self._item()
+        (first_count, first_quantity), (second_count, second_quantity) = self._quantity(first_unit), self._quantity(second_unit)
+        text = f"{first} {first_quantity}, {second} {second_quantity} {self.rng.choice(ADD_VERBS)}"
+        items = [first_item] * first_count + [second_item] * second_count
+        return text, {"intents": ["order.add"], "items": items, "filters": {}}
+
+    def _add_and_pay(self):
+        phrase, item, unit = self._item()
+        count, quantity = self._quantity(unit)
+        text = f"{phrase} {quantity} 담고 결제해줘"
+        return text, {"intents": ["order.add", "order.pay"], "items": [item] * count, "filters": {}}
+
+    # ---- change ----
+    def _update(self):
+        entry = self.rng.choice(self.drinks)
+        if self.rng.random() < 0.5:
+            size = self.rng.choice(SIZES)
+            text = f"{entry['name']} {size} 사이즈로 바꿔줘"
+            options = {"size": size}
+        else:
+            word, value = self.rng.choice(TEMPERATURE_CHANGES)
+            text = f"{entry['name']} {word} 바꿔줘"
+            options = {"temperature": value}
+        return text, {"intents": ["order.update"], "items": [{"name": entry["name"], "options": options}], "filters": {}}
+
+    def _shot(self):
+        entry = self.rng.choice(self.drinks)
+        # 커피/디카페인은 shot, 음료는 shot_add (프롬프트의 샷 옵션 규칙)
+        if entry["category"] == "음료":
+            word, value = self.rng.choice(DRINK_SHOTS)
+            options = {"shot_add": value}
+        else:
+            word, value = self.rng.choice(COFFEE_SHOTS)
+            options = {"shot": value}
+        text = f"{entry['name']} {word}"
+        return text, {"intents": ["order.update"], "items": [{"name": entry["name"], "options": options}], "filters": {}}
+
+    def _replace(self):
+        old, new = self.rng.sample(self.menu, 2)
+        text = f"{josa(old['name'], '을', '를')} {josa(new['name'], '으로', '로')} 바꿔줘"
+        items = [{"name": old["name"]}, {"name": new["name"]}]
+        return text, {"intents": ["order.delete", "order.add"], "items": items, "filters": {}}
+
+    def _delete(self):
+        phrase, item, unit = self._item()
+        count, quantity = self._quantity(unit)
+        if count == 1 and self.rng.random() < 0.5:
+            text = f"{phrase} {self.rng.choice(DELETE_VERBS)}"
+        else:
+            text = f"{phrase} {quantity} {self.rng.choice(DELETE_VERBS)}"
+        return text, {"intents": ["order.delete"], "items": [item] * count, "filters": {}}
+
+    def _bare_option(self):
+        text, options = self.rng.choice(BARE_OPTIONS)
+        return text, {"intents": ["order.update"], "items": [{"options": dict(options)}], "filters": {}}
+
+    # ---- recommend ----
+    def _recommend_category(self):
+        category = self.rng.choice(self.categories)
+        return f"{category} 추천해줘", {"intents": ["recommend"], "categories": [category], "filters": {"count": 3}}
+
+    def _recommend_count(self):
+        count = self.rng.randint(1, 5)
+        if self.rng.random() < 0.5:
+            category = self.rng.choice(self.categories)
+            return (f"{category} {count}개 추천해줘",
+                    {"intents": ["recommend"], "categories": [category], "filters": {"count": count}})
+        return (f"아무거나 {count}개 추천해줘",
+                {"intents": ["recommend"], "categories": list(ALL_CATEGORIES), "filters": {"count": count}})
+
+    def _recommend_mood(self):
+        phrase, tags = self.rng.choice(MOODS)
+        return (f"{phrase} 추천해줘",
+                {"intents": ["recommend"], "categories": list(ALL_CATEGORIES), "filters": {"tag": list(tags), "count": 3}})
+
+    def _recommend_taste(self):
+        phrase, tag = self.rng.choice(TASTES)
+        if self.rng.random() < 0.5:
+            category = self.rng.choice(self.categories)
+            return (f"{category} 중에 {phrase} 추천해줘",
+                    {"intents": ["recommend"], "categories": [category], "filters": {"tag": [tag], "count": 3}})
+        return (f"{phrase} 추천해줘",
+                {"intents": ["recommend"], "categories": list(ALL_CATEGORIES), "filters": {"tag": [tag], "count": 3}})
+
+    def _recommend_price(self):
+        price = self.rng.choice(PRICES)
+        return (f"{price}원 이하로 추천해줘",
+                {"intents": ["recommend"], "categories": list(ALL_CATEGORIES),
+                 "filters": {"price": {"max": price}, "count": 3}})
+
+    # ---- confirm ----
+    def _confirm_target(self):
+        text, target = self.rng.choice(CONFIRM_TARGETS)
+        return text, {"intents": ["confirm"], "target": target, "filters": {}}
+
+    def _confirm_category(self):
+        category = self.rng.choice(self.categories)
+        text = self.rng.choice([f"{category} 메뉴 보여줘", f"{category} 뭐 있어?", f"{category} 종류 알려줘"])
+        return text, {"intents": ["confirm"], "target": "menu", "categories": [category], "filters": {}}
+
+    def _confirm_item(self):
+        entry = self.rng.choice(self.menu)
+        text = self.rng.choice([f"{entry['name']} 있나요?", f"{entry['name']} 있어?"])
+        return text, {"intents": ["confirm"], "target": "menu", "items": [{"name": entry["name"]}], "filters": {}}
+
+    def utterance(self, kind: str) -> Dict:
+        text, expected = self.rng.choice(self.makers[kind])()
+        page = "option" if expected.get("items") and "name" not in expected["items"][0] else PAGES[kind]
+        return {"text": text, "page": page, "kind": kind, "expected": expected}
+
+    def pools(self, unique: int, max_attempts: int = 50) -> Dict[str, List[Dict]]:
+        # 종류별로 비중만큼 서로 다른 발화를 만듦 (조합 수가 부족한 종류는 만들 수 있는 만큼만)
+        total = sum(self.weights)
+        pools = {}
+        for kind, weight in zip(self.kinds, self.weights):
+            target = max(round(unique * weight / total), 1)
+            seen: Dict[str, Dict] = {}
+            for _ in range(target * max_attempts):
+                if len(seen) >= target:
+                    break
+                record = self.utterance(kind)
+                seen.setdefault(record["text"], record)
+            pools[kind] = list(seen.values())
+        return pools
+
+    def pool(self, unique: int) -> List[Dict]:
+        return [record for records in self.pools(unique).values() for record in records]
+
+    def traffic(self, count: int, unique: int, zipf: float = 1.1):
+        # 종류는 비중대로 고르고, 종류 안에서는 풀 순서를 인기 순위로 보고
+        # rank 의 -zipf 제곱에 비례해 뽑음 (zipf=0 이면 균등)
+        pools = self.pools(unique)
+        weights = {
+            kind: list(itertools.accumulate(1 / rank ** zipf for rank in range(1, len(records) + 1)))
+            for kind, records in pools.items()
+        }
+        for kind in self.rng.choices(self.kinds, weights=self.weights, k=count):
+            yield self.rng.choices(pools[kind], cum_weights=weights[kind])[0]
+
+
+def summarize(records: List[Dict]) -> Dict:
+    # 캐시/로컬 처리 효과 추정: 정규화 키 기준 반복 비율 = 무한 캐시의 적중률 상한
+    keys = Counter(normalize.normalize(record["text"]) for record in records)
+    # 현재 설정의 페이지별 슬롯 허용 범위 기준
+    config = runtime_config.current()
+    local = sum(
+        slot_parser.parse_slots(record["text"], slot_parser.allowed_kinds(record["page"], config)) is not None
+        for record in records
+    )
+    total = len(records) or 1
+    return {
+        "requests": len(records),
+        "unique": len(keys),
+        "cache_hit_ceiling": round(1 - len(keys) / total, 4),
+        "top10_share": round(sum(count for _, count in keys.most_common(10)) / total, 4),
+        "slot_parser_local": round(local / total, 4),
+        "kinds": dict(Counter(record["kind"] for record in records)),
+    }
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        kind, _, weight = part.partition("=")
+        if kind.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown kind: {kind}")
+        mix[kind.strip()] = float(weight or 1)
+    return mix
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="합성 발화 트래픽 생성")
+    parser.add_argument("--count", type=int, default=10000, help="생성할 요청 수")
+    parser.add_argument("--unique", type=int, default=1000, help="서로 다른 발화 수")
+    parser.add_argument("--zipf", type=float, default=1.1, help="반복 분포 지수 (0 이면 균등)")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="종류별 비중 (예: order=4,change=2,recommend=2,confirm=2)")
+    parser.add_argument("--menu", default=None, help="메뉴 JSON (없으면 기본 메뉴)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--distinct", action="store_true", help="반복 없이 발화 풀만 출력 (정확도 채점용)")
+    parser.add_argument("--out", default="-")
+    args = parser.parse_args(argv)
+
+    generator = UtteranceGenerator(load_menu(args.menu), args.mix, args.seed)
+    records = generator.pool(args.unique) if args.distinct else list(generator.traffic(args.count, args.unique, args.zipf))
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    try:
+        for record in records:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(json.dumps(summarize(records), ensure_ascii=False), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
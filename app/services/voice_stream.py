@@ -0,0 +1,65 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.services import metrics
+from app.services.normalize import normalize
+
+# WebSocket 한 연결(= sessionId 하나)의 연속 발화를 처리
+# - partial: 음성 인식 중간 결과. 바로 인텐트 추출을 시작해두고(speculative),
+#            텍스트가 바뀌면 이전 추출을 취소한 뒤 새로 시작
+# - final  : 최종 발화. 진행 중인 추출의 텍스트와 같으면 그 결과를 그대로 쓰고,
+#            다르면 새로 추출한 뒤 백엔드로 전달
+SPECULATIVE_MIN_CHARS = 2
+
+Extract = Callable[[str, str], Awaitable[Dict]]
+Dispatch = Callable[[Dict, str, str], Awaitable[Dict]]
+
+
+class VoiceStreamSession:
+    def __init__(self, session_id: str, extract: Extract, dispatch: Dispatch):
+        self.session_id = session_id
+        self.extract = extract
+        self.dispatch = dispatch
+        self._text: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _cancel(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            metrics.inc("stream_speculation_cancelled")
+        self._task = None
+        self._text = None
+
+    def partial(self, text: str, page: str = ""):
+        text = normalize(text)
+        if text == self._text or len(text) < SPECULATIVE_MIN_CHARS:
+            return
+        self._cancel()
+        self._text = text
+        self._task = asyncio.create_task(self.extract(text, page))
+        metrics.inc("stream_speculation_started")
+
+    async def final(self, text: str, page: str = "") -> Dict:
+        text = normalize(text)
+        if self._task is not None and text == self._text:
+            metrics.inc("stream_speculation_hit")
+            task = self._task
+            self._task = None
+            self._text = None
+            intent_result = await task
+        else:
+            self._cancel()
+            metrics.inc("stream_speculation_miss")
+            intent_result = await self.extract(text, page)
+        return await self.dispatch(intent_result, self.session_id, page)
+
+    async def handle(self, message: Dict) -> Optional[Dict]:
+        # partial 은 응답 없음, final 은 백엔드 결과를 돌려줌
+        text = message.get("text", "")
+        if message.get("type", "final") == "partial":
+            self.partial(text, message.get("page", ""))
+            return None
+        return await self.final(text, message.get("page", ""))
+
+    def close(self):
+        self._cancel()
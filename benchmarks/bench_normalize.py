@@ -0,0 +1,29 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.intent_eval import load_corpus
+from app.services.normalize import normalize
+
+# 정규화 처리량 벤치마크 (모든 요청에서 실행되므로 회귀 확인용)
+#   python benchmarks/bench_normalize.py [반복 횟수]
+
+
+def main(rounds: int = 2000):
+    texts = [case["text"] for case in load_corpus()]
+    texts += [text.replace("줘", "주세요") + "  " for text in texts]
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            normalize(text)
+    elapsed = time.perf_counter() - started
+
+    calls = rounds * len(texts)
+    print(f"{calls} calls in {elapsed:.3f}s → {calls / elapsed:,.0f} calls/s, {elapsed / calls * 1e6:.2f} µs/call")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
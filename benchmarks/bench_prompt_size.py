@@ -0,0 +1,37 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services import few_shot, runtime_config
+from app.services.intent_eval import load_corpus
+
+# 전체 프롬프트 대비 적응형 few-shot 프롬프트 크기 / 예시 선택 시간
+# 골든 코퍼스 발화마다 같은 발화의 예시는 빼고 고른다 (정확도는 intent_eval --backend model-adaptive 로 확인)
+#   python benchmarks/bench_prompt_size.py
+
+
+def _chars(messages) -> int:
+    return sum(len(message["content"]) for message in messages)
+
+
+def main():
+    config = runtime_config.current()
+    texts = [case["text"] for case in load_corpus()]
+    full = len(config.system_prompt) + sum(len(text) for text in texts) / len(texts)
+
+    few_shot.get_index(config)
+    started = time.perf_counter()
+    sizes = [_chars(few_shot.make_messages(text, config, exclude=text)) for text in texts]
+    elapsed = time.perf_counter() - started
+
+    adaptive = sum(sizes) / len(sizes)
+    print(f"full prompt:     {full:,.0f} chars/request")
+    print(f"adaptive (k={config.fewshot_k}): {adaptive:,.0f} chars/request (max {max(sizes):,}) "
+          f"→ {adaptive / full:.1%} of full")
+    print(f"example selection: {elapsed / len(texts) * 1e6:.1f} µs/request over {len(config.examples)} examples")
+
+
+if __name__ == "__main__":
+    main()
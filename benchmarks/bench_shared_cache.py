@@ -0,0 +1,90 @@
+import sys
+import json
+import time
+import random
+import tempfile
+import multiprocessing
+from collections import OrderedDict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.shared_cache import SharedTable
+
+# 워커 수에 따른 인텐트 캐시 적중률/조회 지연 비교
+# - private: 워커별 메모리 LRU 만 (INTENT_CACHE_SHARED=false)
+# - shared: 워커별 메모리 LRU 뒤에 워커 간 공유 메모리 테이블 (INTENT_CACHE_SHARED=true)
+# 요청은 Zipf 분포 키를 워커에 고르게 나눠 보내는 것으로 흉내 냄 (uvicorn --workers 의 연결 분산)
+#   python benchmarks/bench_shared_cache.py [전체 요청 수]
+KEYS = 50000
+ZIPF_S = 1.0
+MEMORY_ENTRIES = 2000
+SHARED_SLOTS = 16384
+VALUE = json.dumps({"intents": ["order.add"], "items": [{"name": "아메리카노", "options": {"temperature": "아이스"}}],
+                    "filters": {}}, ensure_ascii=False)
+
+
+def _requests(seed: int, count: int):
+    weights = [1 / (rank ** ZIPF_S) for rank in range(1, KEYS + 1)]
+    return random.Random(seed).choices(range(KEYS), weights=weights, k=count)
+
+
+def _worker(seed, count, path, results):
+    table = SharedTable(path, SHARED_SLOTS, 512) if path else None
+    lru: OrderedDict = OrderedDict()
+    hits, latencies = 0, []
+    for key in _requests(seed, count):
+        key = f"key-{key}"
+        started = time.perf_counter_ns()
+        value = lru.get(key)
+        if value is not None:
+            lru.move_to_end(key)
+        elif table is not None:
+            value = table.get(key)
+        latencies.append(time.perf_counter_ns() - started)
+        if value is not None:
+            hits += 1
+        elif table is not None:
+            # 미스면 모델을 호출했다고 보고 결과를 공유 계층에 기록
+            table.put(key, VALUE)
+        if key not in lru:
+            lru[key] = value or VALUE
+            if len(lru) > MEMORY_ENTRIES:
+                lru.popitem(last=False)
+    if table is not None:
+        table.close()
+    results.put((hits, latencies))
+
+
+def run(shared: bool, workers: int, total: int):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "bench.shm") if shared else ""
+        processes = [
+            context.Process(target=_worker, args=(seed, total // workers, path, results)) for seed in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+    hits = sum(hits for hits, _ in collected)
+    latencies = sorted(latency for _, values in collected for latency in values)
+    p50 = latencies[len(latencies) // 2] / 1000
+    p99 = latencies[int(len(latencies) * 0.99)] / 1000
+    return hits / len(latencies), p50, p99
+
+
+def main(total: int = 200000):
+    # 워커 수와 상관없이 전체 요청 수는 같게 두고 나눠 받음
+    print(f"keys={KEYS} zipf_s={ZIPF_S} memory={MEMORY_ENTRIES}/worker shared={SHARED_SLOTS} requests={total}")
+    print(f"{'workers':>7} {'mode':>8} {'hit rate':>9} {'p50 µs':>8} {'p99 µs':>8}")
+    for workers in (1, 2, 4, 8):
+        for name, shared in (("private", False), ("shared", True)):
+            hit_rate, p50, p99 = run(shared, workers, total)
+            print(f"{workers:>7} {name:>8} {hit_rate:>9.1%} {p50:>8.2f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
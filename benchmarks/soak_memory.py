@@ -0,0 +1,121 @@
+import os
+import sys
+import json
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# 메모리 soak 테스트: 골든 코퍼스 발화를 (가짜 모델 / 가짜 백엔드로) N 번 재생하면서
+# 웜업 이후 메모리가 평평하게 유지되는지 확인한다. 캐시가 상한까지 찬 뒤에는 더 늘어나면 안 된다.
+# 백엔드는 HTTP 클라이언트만 바꿔 끼우므로 실제 dispatcher 의 비동기 큐 / 응답 캐시 / 템플릿 저장소를 모두 거친다.
+#   python benchmarks/soak_memory.py --requests 1000000 --max-growth-mb 2
+#   python benchmarks/soak_memory.py --corpus traffic.jsonl   # utterance_gen 으로 만든 트래픽을 순서대로 재생
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+WORKDIR = tempfile.mkdtemp(prefix="nlp-soak-")
+os.environ.setdefault("INTENT_CACHE_PATH", os.path.join(WORKDIR, "intent_cache.sqlite3"))
+os.environ.setdefault("USAGE_LOG_PATH", os.path.join(WORKDIR, "usage.jsonl"))
+os.environ.setdefault("LOG_PAYLOADS", "false")
+# 선택지 응답(query.reply)은 비동기 큐로 보내 큐도 같이 돌림
+os.environ.setdefault("BACKEND_ASYNC_REQUESTS", "query.reply")
+
+
+class CorpusProvider:
+    # (정규화된) 발화에 해당하는 기대 JSON 을 모델 응답처럼 돌려줌
+    def __init__(self, corpus, normalize):
+        self.answers = {
+            normalize(case["text"]): json.dumps(case["expected"], ensure_ascii=False) for case in corpus
+        }
+
+    async def complete(self, model, messages, temperature):
+        # 코퍼스 반복 모드는 발화 뒤에 붙인 번호를 떼고 찾음
+        text = messages[-1]["content"]
+        content = self.answers.get(text) or self.answers.get(
+            text.rsplit(" ", 1)[0], '{"intents": ["error"], "filters": {}}'
+        )
+        return {"content": content, "usage": {"prompt_tokens": 9000, "completion_tokens": 40, "cached_tokens": 0}}
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeBackend:
+    # dispatcher._client 대신 쓰는 HTTP 클라이언트: 요청마다 새 응답 객체를 만들어 돌려줌 (배치는 배열)
+    async def post(self, url, json):
+        if isinstance(json, list):
+            return FakeResponse([self.answer(item) for item in json])
+        return FakeResponse(self.answer(json))
+
+    @staticmethod
+    def answer(data):
+        payload = data.get("payload") or {}
+        return {"ok": True, "request": data["request"], "page": payload.get("page"), "intents": payload.get("intents")}
+
+    async def aclose(self):
+        pass
+
+
+async def soak(total: int, unique: int, sample_every: int, corpus_path=None):
+    from app.services import completion_provider, normalize, openai_client
+    from app.services.dispatcher import dispatcher
+    from app.services.intent_eval import load_corpus
+
+    corpus = load_corpus(corpus_path) if corpus_path else load_corpus()
+    completion_provider.set_provider(CorpusProvider(corpus, normalize.normalize))
+    dispatcher._client = FakeBackend()
+
+    texts = [case["text"] for case in corpus]
+    samples = []
+    for index in range(total):
+        if corpus_path:
+            # 생성된 트래픽은 반복 분포가 이미 들어 있으므로 그대로 재생
+            case = corpus[index % len(corpus)]
+            text, page = case["text"], case.get("page", "main")
+        else:
+            text, page = f"{texts[index % len(texts)]} {index % unique}", "main"
+        await openai_client.handle_text(text, f"session-{index % 500}", page)
+        if index % sample_every == 0:
+            samples.append((index, tracemalloc.get_traced_memory()[0]))
+    await dispatcher.close()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1_000_000)
+    parser.add_argument("--unique", type=int, default=20_000, help="서로 다른 발화 수 (캐시 상한보다 크게)")
+    parser.add_argument("--warmup", type=float, default=0.2, help="기준선을 잡기 전 웜업 비율")
+    parser.add_argument("--max-growth-mb", type=float, default=2.0)
+    parser.add_argument("--corpus", default=None, help="재생할 트래픽 JSONL (app.services.utterance_gen 출력)")
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    samples = asyncio.run(soak(args.requests, args.unique, max(args.requests // 100, 1), args.corpus))
+    baseline_index = int(len(samples) * args.warmup)
+    baseline = max(size for _, size in samples[:baseline_index + 1])
+    final = max(size for _, size in samples[baseline_index:])
+    growth_mb = (final - baseline) / 1024 / 1024
+
+    for index, size in samples[::10]:
+        print(f"{index:>10} requests  {size / 1024 / 1024:8.2f} MB")
+    print(f"baseline {baseline / 1024 / 1024:.2f} MB → peak after warmup {final / 1024 / 1024:.2f} MB "
+          f"(growth {growth_mb:+.2f} MB, limit {args.max_growth_mb} MB)")
+    sys.exit(0 if growth_mb <= args.max_growth_mb else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services.completion_provider import FixtureStore, RecordingProvider, ReplayProvider
+
+MESSAGES = [{"role": "system", "content": "prompt"}, {"role": "user", "content": "아메리카노 하나"}]
+
+
+class FakeProvider:
+    def __init__(self):
+        self.calls = 0
+
+    async def complete(self, model, messages, temperature):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        return {"content": json.dumps({"intents": ["order.add"]}), "usage": {"prompt_tokens": 10, "completion_tokens": 2, "cached_tokens": 0}}
+
+
+def test_record_then_replay(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    inner = FakeProvider()
+    recorded = asyncio.run(RecordingProvider(inner, store).complete("gpt-4o-mini", MESSAGES, 0.3))
+
+    replayed = asyncio.run(ReplayProvider(store).complete("gpt-4o-mini", MESSAGES, 0.3))
+    assert replayed == recorded
+    assert inner.calls == 1
+
+
+def test_replay_original_latency_and_missing_fixture(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    asyncio.run(RecordingProvider(FakeProvider(), store).complete("gpt-4o-mini", MESSAGES, 0.3))
+
+    async def timed():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await ReplayProvider(store, "original").complete("gpt-4o-mini", MESSAGES, 0.3)
+        return loop.time() - started
+
+    assert asyncio.run(timed()) >= 0.015
+
+    with pytest.raises(LookupError):
+        asyncio.run(ReplayProvider(store).complete("gpt-4o", MESSAGES, 0.3))
@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+from app.services import dispatcher as dispatcher_module
+from app.services import response_cache
+from app.services.dispatcher import BackendDispatcher
+
+
+class FakeStatusError(Exception):
+    def __init__(self, response):
+        super().__init__(f"status {response.status_code}")
+        self.response = response
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise FakeStatusError(self)
+
+
+class FakeClient:
+    # 요청을 기록하고 준비된 응답을 차례로 돌려주는 HTTP 클라이언트 (없으면 요청 배열 그대로 응답)
+    def __init__(self, responses=None):
+        self.responses = list(responses or [])
+        self.posts = []
+
+    async def post(self, url, json):
+        self.posts.append((url, json))
+        if self.responses:
+            return self.responses.pop(0)
+        if isinstance(json, list):
+            return FakeResponse([{"echo": item["sessionId"]} for item in json])
+        return FakeResponse({"echo": json["sessionId"]})
+
+    async def aclose(self):
+        pass
+
+
+def make_dispatcher(client):
+    dispatcher = BackendDispatcher()
+    dispatcher._client = client
+    return dispatcher
+
+
+def request(session_id, intents=("order.add",)):
+    return {"request": "query.sequence", "payload": {"intents": list(intents)}, "sessionId": session_id}
+
+
+@pytest.fixture
+def batch_mode(monkeypatch):
+    monkeypatch.setattr(dispatcher_module, "DISPATCH_MODE", "batch")
+    monkeypatch.setattr(dispatcher_module, "BACKEND_BATCH_URL", "http://backend/batch")
+    monkeypatch.setattr(dispatcher_module, "BATCH_WINDOW", 0.01)
+
+
+def run_batch(client, count=3):
+    async def run():
+        dispatcher = make_dispatcher(client)
+        return await asyncio.gather(
+            *(dispatcher.dispatch(request(f"s{i}")) for i in range(count)), return_exceptions=True
+        )
+    return asyncio.run(run())
+
+
+def test_batch_results_are_aligned(batch_mode):
+    client = FakeClient()
+    assert run_batch(client) == [{"echo": "s0"}, {"echo": "s1"}, {"echo": "s2"}]
+    assert len(client.posts) == 1
+
+
+@pytest.mark.parametrize("body", [[{"echo": "s0"}, {"echo": "s1"}], {"error": "down"}])
+def test_mismatched_batch_response_fails_every_caller(batch_mode, body):
+    results = run_batch(FakeClient([FakeResponse(body)]))
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_batch_http_error_fails_every_caller(batch_mode):
+    results = run_batch(FakeClient([FakeResponse([{}, {}, {}], status_code=502)]))
+    assert all(isinstance(result, FakeStatusError) for result in results)
+
+
+def test_queue_retries_server_errors(monkeypatch):
+    monkeypatch.setattr(dispatcher_module, "RETRY_BACKOFF", 0)
+    client = FakeClient([FakeResponse({}, 503), FakeResponse({}, 500), FakeResponse({"ok": True})])
+
+    async def run():
+        dispatcher = make_dispatcher(client)
+        assert dispatcher.deliver_later(request("s1")) == {"status": "accepted"}
+        await dispatcher.close()
+
+    asyncio.run(run())
+    assert len(client.posts) == 3
+
+
+def test_queue_does_not_retry_client_errors(monkeypatch):
+    monkeypatch.setattr(dispatcher_module, "RETRY_BACKOFF", 0)
+    client = FakeClient([FakeResponse({}, 400)])
+
+    async def run():
+        dispatcher = make_dispatcher(client)
+        dispatcher.deliver_later(request("s1"))
+        await dispatcher.close()
+
+    asyncio.run(run())
+    assert len(client.posts) == 1
+
+
+def test_sync_mode_passes_backend_body_through():
+    client = FakeClient([FakeResponse({"message": "잘못된 요청"}, 400)])
+    assert asyncio.run(make_dispatcher(client).dispatch(request("s1"))) == {"message": "잘못된 요청"}
+
+
+def test_menu_confirm_uses_response_cache(monkeypatch):
+    monkeypatch.setattr(response_cache, "cache", response_cache.ResponseCache())
+    client = FakeClient([FakeResponse({"menus": [1]})])
+    menu = {"request": "query.sequence", "payload": {"intents": ["confirm"], "target": "menu", "categories": ["커피"]}}
+
+    async def run():
+        dispatcher = make_dispatcher(client)
+        first = await dispatcher.dispatch({**menu, "sessionId": "a"}, "v1")
+        second = await dispatcher.dispatch({**menu, "sessionId": "b"}, "v1")
+        return first, second
+
+    assert asyncio.run(run()) == ({"menus": [1]}, {"menus": [1]})
+    assert len(client.posts) == 1
@@ -0,0 +1,53 @@
+import json
+
+from app.services import few_shot, usage
+from app.services.runtime_config import ConfigSnapshot
+
+EXAMPLES = [
+    {"text": "초코라떼에 샷 하나 넣어줘", "output": {"intents": ["order.update"], "items": [{"name": "초코라떼", "options": {"shot_add": "1샷 추가"}}]}},
+    {"text": "카페라떼를 아메리카노로 바꿔줘", "output": {"intents": ["order.delete", "order.add"], "items": [{"name": "카페라떼"}, {"name": "아메리카노"}]}},
+    {"text": "단 거 빼고 추천해줘", "output": {"intents": ["recommend"], "filters": {"exclude_tags": ["sweet"], "count": 3}}},
+    {"text": "그만할래", "output": {"intents": ["exit"], "filters": {}}},
+]
+
+
+def make_config(**settings):
+    return ConfigSnapshot(settings, "전체 프롬프트", core_prompt="규칙 요약", examples=EXAMPLES, examples_version="v1")
+
+
+def test_search_prefers_similar_examples():
+    index = few_shot.ExampleIndex(EXAMPLES)
+    assert [index.texts[i] for _, i in index.search("바닐라라떼에 샷 두 개 넣어줘", 1)] == ["초코라떼에 샷 1개 넣어줘"]
+    assert [index.texts[i] for _, i in index.search("녹차라떼를 아메리카노로 바꿔줘", 1)] == ["카페라떼를 아메리카노로 바꿔줘"]
+
+
+def test_search_can_exclude_the_same_utterance():
+    index = few_shot.ExampleIndex(EXAMPLES)
+    assert "그만할래" not in [index.texts[i] for _, i in index.search("그만할래", 4, exclude="그만할래")]
+
+
+def test_messages_are_core_then_example_pairs_then_input():
+    messages = few_shot.make_messages("아이스티에 샷 넣어줘", make_config(fewshot_k=2))
+    assert messages[0] == {"role": "system", "content": "규칙 요약"}
+    assert [m["role"] for m in messages[1:]] == ["user", "assistant", "user", "assistant", "user"]
+    # 가장 비슷한 예시가 현재 발화 바로 앞에 옴
+    assert messages[-3]["content"] == "초코라떼에 샷 1개 넣어줘"
+    assert json.loads(messages[-2]["content"])["items"][0]["options"] == {"shot_add": "1샷 추가"}
+    assert messages[-1] == {"role": "user", "content": "아이스티에 샷 넣어줘"}
+
+
+def test_choose_mode(monkeypatch):
+    assert few_shot.choose_mode(make_config()) == "full"
+    assert few_shot.choose_mode(make_config(prompt_mode="adaptive")) == "adaptive"
+    # 예시 저장소가 없으면 전체 프롬프트로
+    assert few_shot.choose_mode(ConfigSnapshot({"prompt_mode": "adaptive"}, "전체 프롬프트")) == "full"
+
+    monkeypatch.setattr(usage.tracker, "over_budget", lambda: True)
+    assert few_shot.choose_mode(make_config()) == "adaptive"
+
+
+def test_adaptive_mode_has_its_own_cache_fingerprint():
+    config = make_config()
+    assert config.fingerprint_for("adaptive") != config.fingerprint_for("full")
+    assert make_config(fewshot_k=2).fingerprint_for("adaptive") != config.fingerprint_for("adaptive")
+    assert make_config(fewshot_k=2).fingerprint_for("full") == config.fingerprint_for("full")
@@ -0,0 +1,82 @@
+import threading
+
+from app.services.intent_cache import IntentCache, make_key
+
+
+def make_cache(tmp_path, max_entries=100, memory_entries=10):
+    return IntentCache(str(tmp_path / "cache.sqlite3"), max_entries, memory_entries, flush_interval=0.01)
+
+
+def test_key_ignores_spacing_and_case():
+    assert make_key("아이스  아메리카노 ", "fp") == make_key("아이스 아메리카노", "fp")
+    assert make_key("아이스 아메리카노", "fp") != make_key("아이스 아메리카노", "other")
+
+
+def test_entries_survive_restart(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("k", {"intents": ["order.add"], "items": [{"name": "아메리카노"}]})
+    cache.close()
+
+    reopened = make_cache(tmp_path)
+    assert reopened.get("k") == {"intents": ["order.add"], "items": [{"name": "아메리카노"}]}
+    reopened.close()
+
+
+def test_get_returns_copy(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("k", {"intents": ["help"], "filters": {}})
+    cache.get("k")["filters"]["page"] = "main"
+    assert cache.get("k") == {"intents": ["help"], "filters": {}}
+    cache.close()
+
+
+def test_disk_eviction_is_lru(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    cache.flush()
+    cache.get("a")
+    cache.flush()
+    cache.put("c", {"n": 3})
+    cache.close()
+
+    reopened = make_cache(tmp_path, max_entries=2, memory_entries=0)
+    assert reopened.get("b") is None
+    assert reopened.get("a") == {"n": 1}
+    assert reopened.get("c") == {"n": 3}
+    reopened.close()
+
+
+def test_warm_up_loads_hottest_entries(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("cold", {"n": 0})
+    cache.put("hot", {"n": 1})
+    cache.flush()
+    for _ in range(3):
+        cache.get("hot")
+    cache.close()
+
+    reopened = make_cache(tmp_path, memory_entries=1)
+    assert reopened.warm_up() == 1
+    assert list(reopened._memory) == ["hot"]
+    reopened.close()
+
+
+def test_memory_tier_respects_byte_cap(tmp_path):
+    cache = IntentCache(str(tmp_path / "cache.sqlite3"), 1000, 1000, flush_interval=0.01, memory_bytes=4096)
+    for index in range(100):
+        cache.put(f"k{index}", {"intents": ["order.add"], "items": [{"name": "아메리카노" * 5}]})
+    assert 0 < cache.memory_used <= 4096
+    assert "k99" in cache._memory and "k0" not in cache._memory
+    cache.close()
+
+
+def test_full_write_queue_drops_instead_of_blocking(tmp_path):
+    cache = IntentCache(str(tmp_path / "cache.sqlite3"), 100, 10, write_queue_max=2)
+    # 쓰기 스레드가 멈춘 상황: 큐를 비우는 쪽이 없음
+    cache._writer = threading.current_thread()
+    cache.put("k", {"n": 1})
+    for _ in range(5):
+        assert cache.get("k") == {"n": 1}
+    assert cache._writes.qsize() == 2
+    assert cache.dropped_writes == 4
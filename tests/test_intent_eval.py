@@ -0,0 +1,36 @@
+import asyncio
+
+from app.services.intent_eval import BACKENDS, compare, evaluate, load_corpus
+
+INTENTS = {"recommend", "order.add", "order.update", "order.delete", "order.pay", "confirm", "exit", "help", "error"}
+
+
+def test_corpus_is_well_formed():
+    corpus = load_corpus()
+    assert len(corpus) >= 40
+    assert len({case["text"] for case in corpus}) == len(corpus)
+    for case in corpus:
+        expected = case["expected"]
+        assert expected.get("intents") or expected.get("action"), case["text"]
+        assert set(expected.get("intents") or []) <= INTENTS, case["text"]
+
+
+def test_compare_ignores_empty_fields_and_tag_order():
+    expected = {"intents": ["recommend"], "filters": {"tag": ["warm", "sweet"], "count": 3}, "categories": ["커피", "음료"]}
+    actual = {"intents": ["recommend"], "filters": {"tag": ["sweet", "warm"], "count": 3, "exclude_tags": []},
+              "categories": ["음료", "커피"], "items": []}
+    assert all(compare(expected, actual).values())
+
+
+def test_compare_keeps_intent_and_item_order():
+    expected = {"intents": ["order.delete", "order.add"], "items": [{"name": "카페라떼"}, {"name": "아메리카노"}]}
+    actual = {"intents": ["order.add", "order.delete"], "items": [{"name": "아메리카노"}, {"name": "카페라떼"}]}
+    result = compare(expected, actual)
+    assert not result["intents"] and not result["items"]
+    assert result["filters"] and result["target"]
+
+
+def test_expected_backend_scores_perfectly():
+    report = asyncio.run(evaluate(BACKENDS["expected"](), load_corpus()))
+    assert report["summary"]["exact_accuracy"] == 1.0
+    assert report["summary"]["handled"] == report["summary"]["cases"]
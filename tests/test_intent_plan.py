@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from app.services import intent_plan
+from app.services.intent_plan import execute, plan, split
+
+
+@pytest.fixture(autouse=True)
+def parallel(monkeypatch):
+    monkeypatch.setattr(intent_plan, "PLAN_PARALLEL", True)
+
+
+def test_state_changing_intents_stay_in_one_ordered_group():
+    assert plan({"intents": ["order.delete", "order.add"]}) == [["order.delete", "order.add"]]
+    assert plan({"intents": ["order.update", "order.pay"]}) == [["order.update", "order.pay"]]
+
+
+def test_cart_confirm_is_ordered_with_writes():
+    assert plan({"intents": ["order.add", "confirm"], "target": "cart"}) == [["order.add", "confirm"]]
+    assert plan({"intents": ["confirm", "order.delete"]}) == [["confirm", "order.delete"]]
+
+
+def test_independent_reads_are_split():
+    assert plan({"intents": ["recommend", "order.add"]}) == [["recommend"], ["order.add"]]
+    assert plan({"intents": ["confirm", "recommend"], "target": "cart"}) == [["confirm"], ["recommend"]]
+    assert plan({"intents": ["confirm", "order.add"], "target": "menu"}) == [["confirm"], ["order.add"]]
+
+
+def test_groups_keep_relative_order():
+    result = {"intents": ["order.delete", "recommend", "order.add", "confirm"], "target": "cart"}
+    assert plan(result) == [["order.delete", "order.add", "confirm"], ["recommend"]]
+
+
+def test_split_gives_each_group_only_its_own_fields():
+    result = {
+        "intents": ["order.add", "recommend"],
+        "items": [{"name": "아메리카노"}],
+        "categories": ["디저트"],
+        "filters": {"tag": ["sweet"], "count": 3},
+    }
+    order, recommend = (split(result, group) for group in plan(result))
+    assert order == {"intents": ["order.add"], "items": [{"name": "아메리카노"}], "filters": {}}
+    assert recommend == {"intents": ["recommend"], "categories": ["디저트"], "filters": {"tag": ["sweet"], "count": 3}}
+
+
+def test_split_keeps_confirm_fields():
+    result = {"intents": ["confirm", "order.add"], "target": "menu", "categories": ["커피"],
+              "items": [{"name": "카페라떼"}], "filters": {}}
+    confirm, order = (split(result, group) for group in plan(result))
+    assert confirm == result | {"intents": ["confirm"]}
+    # target 은 confirm 전용이므로 주문 묶음에는 넣지 않음
+    assert order == {"intents": ["order.add"], "items": [{"name": "카페라떼"}], "filters": {}}
+
+
+def test_disabled_by_default_keeps_one_request(monkeypatch):
+    monkeypatch.setattr(intent_plan, "PLAN_PARALLEL", False)
+    assert plan({"intents": ["recommend", "order.add"]}) == [["recommend", "order.add"]]
+
+
+def test_execute_runs_groups_concurrently_and_keeps_single_shape():
+    events = []
+
+    async def dispatch(result):
+        name = "+".join(result["intents"])
+        events.append(("start", name))
+        await asyncio.sleep(0.01)
+        events.append(("end", name))
+        return name
+
+    single = asyncio.run(execute({"intents": ["order.add", "order.pay"], "items": []}, dispatch))
+    assert single == "order.add+order.pay"
+
+    events.clear()
+    responses = asyncio.run(execute({"intents": ["order.add", "recommend"], "items": [], "filters": {}}, dispatch))
+    assert responses == ["order.add", "recommend"]
+    assert events[:2] == [("start", "order.add"), ("start", "recommend")]
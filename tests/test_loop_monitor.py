@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+from app.services.loop_monitor import LoopMonitor
+
+
+def blocking_call():
+    time.sleep(0.15)
+
+
+def test_blocking_call_is_detected_with_stack():
+    monitor = LoopMonitor(interval=0.01, debug=True, block_threshold_ms=50)
+
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.03)
+        blocking_call()
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+    asyncio.run(run())
+    assert monitor.max_lag >= 0.1
+    assert any("blocking_call" in stack for stack in monitor.blocked_stacks)
+
+
+def test_debug_enables_asyncio_slow_callback_log(caplog):
+    monitor = LoopMonitor(interval=0.01, debug=True, block_threshold_ms=50)
+
+    async def run():
+        monitor.start()
+        assert asyncio.get_running_loop().get_debug()
+        await asyncio.sleep(0.01)
+        blocking_call()
+        await asyncio.sleep(0.01)
+        await monitor.stop()
+
+    with caplog.at_level("WARNING", logger="asyncio"):
+        asyncio.run(run())
+    assert any("took" in record.getMessage() for record in caplog.records)
+
+
+def test_no_report_when_loop_is_idle():
+    monitor = LoopMonitor(interval=0.01, debug=True, block_threshold_ms=50)
+
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+    asyncio.run(run())
+    assert monitor.blocked_stacks == []
@@ -0,0 +1,106 @@
+from app.services.menu_filter import MenuFilterEngine
+
+MENU = [
+    {"id": 1, "name": "아메리카노", "category": "커피", "price": 2000, "tags": ["bitter", "popular"]},
+    {"id": 2, "name": "카페라떼", "category": "커피", "price": 3000, "tags": ["creamy"], "ingredients": ["우유"]},
+    {"id": 3, "name": "초코라떼", "category": "음료", "price": 3500, "tags": ["sweet", "creamy"], "ingredients": ["우유"]},
+    {"id": 4, "name": "딸기스무디", "category": "음료", "price": 4500, "tags": ["sweet", "fruity"], "ingredients": ["딸기"]},
+    {"id": 5, "name": "브라우니", "category": "디저트", "price": 3000, "tags": ["sweet", "popular"]},
+    {"id": 6, "name": "디카페인 아메리카노", "category": "디카페인", "price": 2500, "tags": ["bitter"]},
+]
+
+
+def recommend(categories=None, **filters):
+    result = {"intents": ["recommend"], "filters": filters}
+    if categories:
+        result["categories"] = categories
+    return MenuFilterEngine(MENU).evaluate(result)
+
+
+def test_price_range_and_sort():
+    result = recommend(price={"max": 3000, "sort": "desc"}, count=5)
+    assert result["candidates"] == [2, 5, 6, 1]
+
+
+def test_tags_categories_and_ingredients():
+    assert recommend(["음료", "디저트"], tag=["sweet"], exclude_ingredients=["딸기"])["candidates"] == [5, 3]
+    assert recommend(include_ingredients=["우유"], exclude_tags=["sweet"])["candidates"] == [2]
+    assert recommend(caffeine="decaf")["candidates"] == [6]
+
+
+def test_default_count_and_popular_first():
+    assert recommend()["candidates"] == [1, 5, 2]
+
+
+def test_group_counts_allocation():
+    result = recommend(["커피", "음료"], group_counts={"tag:음료:sweet": 1, "커피": 2})
+    assert result["candidate_groups"] == {"tag:음료:sweet": [3], "커피": [1, 2]}
+    assert result["candidates"] == [3, 1, 2]
+    assert result["filter_issues"] == []
+
+
+def test_group_shortfall_and_no_match_are_reported():
+    result = recommend(["디저트"], group_counts={"디저트": 2})
+    assert "group 디저트 has 1 of 2 candidates" in result["filter_issues"]
+
+    result = recommend(["디저트"], price={"max": 1000})
+    assert result["candidates"] == []
+    assert "no_match" in result["filter_issues"]
+
+
+def test_validation():
+    engine = MenuFilterEngine(MENU)
+    issues = engine.validate({
+        "categories": ["빵"],
+        "filters": {"price": {"min": 5000, "max": 1000}, "count": 0, "size": "L",
+                    "group_counts": {"tag:빵:sweet": 1, "spicy": 1}},
+    })
+    assert issues == [
+        "unknown filter: size",
+        "unknown category: 빵",
+        "price.min is greater than price.max",
+        "invalid count: 0",
+        "invalid group key: tag:빵:sweet",
+        "unknown group key: spicy",
+    ]
+
+
+def test_non_numeric_price_is_reported_and_skipped():
+    result = recommend(price={"min": None, "max": "abc"}, count=6)
+    assert len(result["candidates"]) == 6
+    assert "invalid price.min: None" in result["filter_issues"]
+    assert "invalid price.max: 'abc'" in result["filter_issues"]
+
+
+def test_numeric_string_price_is_coerced():
+    result = recommend(price={"max": "3000", "sort": "asc"}, count=6)
+    assert result["candidates"] == [1, 6, 2, 5]
+    assert result["filter_issues"] == []
+
+
+def test_invalid_count_falls_back_to_default():
+    for count in (-1, 0, True, "2"):
+        result = recommend(count=count)
+        assert result["candidates"] == [1, 5, 2], count
+        assert f"invalid count: {count!r}" in result["filter_issues"]
+        assert "no_match" not in result["filter_issues"]
+
+
+def test_invalid_group_count_is_skipped():
+    result = recommend(["커피", "음료"], group_counts={"커피": -1, "음료": True, "tag:음료:sweet": 1})
+    assert result["candidate_groups"] == {"tag:음료:sweet": [3]}
+    assert "invalid group count: 커피=-1" in result["filter_issues"]
+    assert "invalid group count: 음료=True" in result["filter_issues"]
+
+
+def test_gender_groups_split_headcount_without_menu_tags():
+    result = recommend(["커피", "음료"], group_counts={"gender_male": 2, "gender_female": 1})
+    assert result["candidate_groups"] == {"gender_male": [1, 2], "gender_female": [3]}
+    assert result["filter_issues"] == []
+
+    # 메뉴에 해당 태그가 있으면 그 태그로 고름
+    menu = MENU + [{"id": 7, "name": "자몽에이드", "category": "음료", "price": 4000, "tags": ["gender_female"]}]
+    result = MenuFilterEngine(menu).evaluate(
+        {"intents": ["recommend"], "filters": {"group_counts": {"gender_female": 1}}}
+    )
+    assert result["candidate_groups"] == {"gender_female": [7]}
@@ -0,0 +1,16 @@
+from app.services import metrics
+
+
+def test_series_are_capped(monkeypatch):
+    metrics.reset()
+    monkeypatch.setattr(metrics, "METRICS_MAX_SERIES", 3)
+    for page in range(10):
+        metrics.inc("requests", page=page)
+    metrics.record("alloc_bytes", 100, stage="other")
+    metrics.inc("requests", page=0)
+
+    snapshot = metrics.snapshot()
+    assert len(snapshot["counters"]) == 3
+    assert snapshot["counters"]["requests{page=0}"] == 2
+    assert snapshot["dropped_series"] == 8
+    metrics.reset()
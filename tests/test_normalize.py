@@ -0,0 +1,30 @@
+import pytest
+
+from app.services.normalize import normalize
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("  아이스 아메리카노   두 잔 주세요. ", "아이스 아메리카노 2잔 줘"),
+    ("카페라떼 2 개 삭제해줘!!", "카페라떼 2개 삭제해줘"),
+    ("샷 두 개 추가해줘", "샷 2개 추가해줘"),
+    ("아메리카노 하나만", "아메리카노 1개만"),
+    ("라지로요", "L로"),
+    ("미디움 사이즈로 바꿔줄래요?", "M 사이즈로 바꿔줘?"),
+    ("m", "M"),
+    ("hot으로 바꿔주세요", "핫으로 바꿔줘"),
+    ("아아 하나 주세요", "아이스 아메리카노 1개 줘"),
+])
+def test_normalize(text, expected):
+    assert normalize(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "에스프레소 추가해줘",
+    "아이스티 2개 중에 하나는 M 사이즈로, 하나는 S 사이즈로 바꿔줘",
+    "어떻게 사용하는 거야?",
+    "자바칩 프라푸치노 줘",
+    "둘 다 아이스로 바꿔줘",
+    "셋 다요",
+])
+def test_normalize_leaves_canonical_text_alone(text):
+    assert normalize(text) == text
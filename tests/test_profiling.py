@@ -0,0 +1,72 @@
+import json
+import asyncio
+import threading
+import time
+
+from app.services import profiling
+
+
+def test_span_is_noop_without_trace():
+    with profiling.span("call_openai"):
+        pass
+
+
+def test_slow_request_trace_is_captured(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(profiling, "SLOW_REQUEST_MS", 5)
+    monkeypatch.setattr(profiling, "SLOW_TRACE_DIR", str(tmp_path))
+
+    with profiling.trace_request("/voice/process") as trace:
+        with profiling.span("call_openai"):
+            time.sleep(0.01)
+        with profiling.span("send_to_backend"):
+            pass
+
+    assert [span["name"] for span in trace.spans] == ["call_openai", "send_to_backend"]
+    assert trace.spans[0]["wall_ms"] >= 10
+    dumped = json.loads(next(tmp_path.iterdir()).read_text(encoding="utf-8"))
+    assert dumped["name"] == "/voice/process"
+    assert profiling.recent_slow_traces[-1]["spans"] == trace.spans
+
+
+def test_slow_trace_is_written_off_loop_and_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(profiling, "SLOW_REQUEST_MS", 0)
+    monkeypatch.setattr(profiling, "SLOW_TRACE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling, "SLOW_TRACE_KEEP", 3)
+    for index in range(5):
+        (tmp_path / f"100000000000{index}-old.json").write_text("{}", encoding="utf-8")
+    writers = []
+    write_trace = profiling._write_trace
+    monkeypatch.setattr(profiling, "_write_trace",
+                        lambda data: writers.append(threading.current_thread()) or write_trace(data))
+
+    async def request():
+        with profiling.trace_request("/voice/process"):
+            pass
+
+    # asyncio.run 은 끝날 때 기본 executor 의 작업을 기다림
+    asyncio.run(request())
+    assert writers and writers[0] is not threading.main_thread()
+    files = sorted(path.name for path in tmp_path.iterdir())
+    assert len(files) == 3
+    assert files[-1].endswith("-voice_process.json")
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampling_profiler_collapses_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,))
+    worker.start()
+    profiler = profiling.SamplingProfiler(interval=0.001)
+    profiler.start(0.05)
+    profiler._thread.join()
+    stop.set()
+    worker.join()
+
+    assert profiler.sample_count > 0
+    assert "busy_loop (test_profiling.py:" in profiler.collapsed()
@@ -0,0 +1,76 @@
+import time
+
+from app.services.response_cache import ResponseCache, cache_key
+
+COFFEE = {"intents": ["confirm"], "target": "menu", "categories": ["커피"], "filters": {}, "page": "main"}
+
+
+def request(payload, session_id="s1"):
+    return {"request": "query.sequence", "payload": dict(payload), "sessionId": session_id}
+
+
+def test_key_only_for_menu_confirm_and_ignores_session():
+    assert cache_key(request(COFFEE, "s1")) == cache_key(request(COFFEE, "s2"))
+    assert cache_key(request(COFFEE)) != cache_key(request({**COFFEE, "categories": ["음료"]}))
+    assert cache_key(request({**COFFEE, "target": "cart"})) is None
+    assert cache_key(request({"intents": ["confirm", "order.pay"], "target": "menu"})) is None
+    assert cache_key(request({"intents": ["order.add"], "items": [{"name": "아메리카노"}]})) is None
+
+
+def test_key_is_canonical():
+    reordered = {"page": "main", "filters": {}, "categories": ["커피"], "target": "menu", "intents": ["confirm"]}
+    assert cache_key(request(COFFEE)) == cache_key(request(reordered))
+
+
+def test_get_returns_copy_and_expires():
+    cache = ResponseCache(ttl=0.05)
+    key = cache_key(request(COFFEE))
+    cache.put(key, {"menus": [1, 2]}, "v1")
+    cached = cache.get(key, "v1")
+    cached["menus"].append(3)
+    assert cache.get(key, "v1") == {"menus": [1, 2]}
+    time.sleep(0.06)
+    assert cache.get(key, "v1") is None
+
+
+def test_menu_version_change_purges():
+    cache = ResponseCache()
+    cache.put("k", {"menus": []}, "v1")
+    assert cache.get("k", "v2") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_failed_or_accepted_responses_are_not_cached():
+    cache = ResponseCache()
+    cache.put("a", {"error": "timeout"})
+    cache.put("b", {"status": "accepted"})
+    cache.put("c", None)
+    assert cache.stats()["entries"] == 0
+
+
+def test_bounded_and_purgeable():
+    cache = ResponseCache(max_entries=2)
+    for key in "abc":
+        cache.put(key, {"key": key})
+    assert cache.get("a") is None and cache.get("c") == {"key": "c"}
+    assert cache.purge() == 2
+    assert cache.get("c") is None
+
+
+def test_byte_cap_evicts_least_recent():
+    menus = {"menus": ["메뉴" * 50] * 10}
+    # 상한보다 큰 응답은 저장하지 않음
+    cache = ResponseCache(max_bytes=1)
+    cache.put("k", menus)
+    assert cache.stats()["entries"] == 0
+
+    cache = ResponseCache()
+    cache.put("a", menus)
+    one = cache.stats()["bytes"]
+    cache = ResponseCache(max_bytes=one * 2)
+    for key in "abc":
+        cache.put(key, menus)
+    assert cache.get("a") is None and cache.get("c") == menus
+    assert cache.stats()["bytes"] == one * 2
+    cache.purge()
+    assert cache.stats()["bytes"] == 0
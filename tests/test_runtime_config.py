@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+from app.services import menu_filter
+from app.services.runtime_config import ConfigSnapshot, ConfigStore
+
+MENU = [{"id": 1, "name": "아메리카노", "category": "커피", "price": 2000, "tags": ["popular"]}]
+
+
+def make_store(tmp_path):
+    (tmp_path / "prompts").mkdir()
+    (tmp_path / "prompts" / "system.txt").write_text("너는 키오스크 도우미야.\n", encoding="utf-8")
+    (tmp_path / "settings.json").write_text(json.dumps({"version": "1", "model": "m1"}), encoding="utf-8")
+    (tmp_path / "menu.json").write_text(json.dumps(MENU), encoding="utf-8")
+    return ConfigStore(str(tmp_path), str(tmp_path / "menu.json"))
+
+
+def test_initial_snapshot(tmp_path):
+    config = make_store(tmp_path).current
+    assert config.model == "m1"
+    assert config.temperature == 0.3
+    assert config.system_message == {"role": "system", "content": "너는 키오스크 도우미야."}
+    assert config.menu == MENU
+
+
+def test_reload_swaps_only_changed_parts(tmp_path):
+    store = make_store(tmp_path)
+    first = store.current
+    assert store.reload() is False
+
+    (tmp_path / "menu.json").write_text(json.dumps(MENU + [{"id": 2, "name": "카페라떼"}]), encoding="utf-8")
+    assert store.reload() is True
+    second = store.current
+    assert second.menu_version != first.menu_version
+    assert second.prompt_fingerprint == first.prompt_fingerprint
+
+    (tmp_path / "prompts" / "system.txt").write_text("너는 카페 키오스크 도우미야.\n", encoding="utf-8")
+    assert store.reload() is True
+    assert store.current.prompt_fingerprint != second.prompt_fingerprint
+    assert store.current.menu_version == second.menu_version
+    # 이전 스냅샷은 그대로 (진행 중인 요청은 처음 잡은 설정을 계속 사용)
+    assert first.system_prompt == "너는 키오스크 도우미야."
+
+
+def test_broken_file_keeps_previous_config(tmp_path):
+    store = make_store(tmp_path)
+    before = store.current
+    (tmp_path / "settings.json").write_text('{"model": ', encoding="utf-8")
+    assert store.reload() is False
+    assert store.current is before
+
+
+def test_wrong_settings_shape_keeps_previous_config(tmp_path):
+    store = make_store(tmp_path)
+    before = store.current
+    for settings in ([1, 2], {"slot_pages": ["size"]}, {"slot_pages": {"option": "size"}}, {"temperature": "hot"}):
+        (tmp_path / "settings.json").write_text(json.dumps(settings), encoding="utf-8")
+        assert store.reload(force=True) is False
+        assert store.current is before
+
+
+def test_watcher_survives_unexpected_errors(tmp_path, monkeypatch):
+    store = make_store(tmp_path)
+    store.interval = 0.001
+    calls = []
+
+    def reload():
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(store, "reload", reload)
+
+    async def run():
+        store.start()
+        await asyncio.sleep(0.05)
+        assert not store._task.done()
+        await store.stop()
+
+    asyncio.run(run())
+    assert len(calls) > 1
+
+
+def test_invalid_menu_keeps_previous_config(tmp_path):
+    store = make_store(tmp_path)
+    before = store.current
+    (tmp_path / "menu.json").write_text(json.dumps(MENU + [{"id": 2, "price": 3000}]), encoding="utf-8")
+    assert store.reload() is False
+    assert store.current is before
+
+    (tmp_path / "menu.json").write_text(json.dumps([{"name": "카페라떼", "price": "3천원"}]), encoding="utf-8")
+    assert store.reload() is False
+    assert store.current is before
+
+
+def test_menu_engine_rebuilt_only_on_menu_change(tmp_path):
+    store = make_store(tmp_path)
+    engine = menu_filter.get_engine(store.current)
+    assert engine.names == ["아메리카노"]
+
+    (tmp_path / "settings.json").write_text(json.dumps({"version": "2", "model": "m2"}), encoding="utf-8")
+    store.reload()
+    assert menu_filter.get_engine(store.current) is engine
+
+    (tmp_path / "menu.json").write_text(json.dumps(MENU + [{"id": 2, "name": "카페라떼"}]), encoding="utf-8")
+    store.reload()
+    assert menu_filter.get_engine(store.current).names == ["아메리카노", "카페라떼"]
+
+
+def test_page_label_only_for_registered_pages():
+    config = ConfigSnapshot({"slot_pages": {"main": [], "option": ["size"], "*": []}}, "")
+    assert config.page_label("option") == "option"
+    assert config.page_label("main") == "main"
+    assert config.page_label("kiosk-1234") == "other"
+    assert config.page_label("*") == "other"
+    assert config.page_label("") == "other"
@@ -0,0 +1,122 @@
+import time
+import asyncio
+
+import pytest
+
+from app.services import metrics
+from app.services.scheduler import FairScheduler, SchedulerFull, tenant_for
+
+
+def run_order(scheduler, requests):
+    # 자리 하나를 먼저 점유해 둔 뒤 requests 를 순서대로 대기열에 넣고, 자리를 받은 순서를 돌려줌
+    order = []
+
+    async def request(tenant, deadline):
+        async with scheduler.slot(tenant, deadline):
+            order.append(tenant)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.slot("holder"):
+                await release.wait()
+
+        tasks = [asyncio.create_task(holder())]
+        await asyncio.sleep(0)
+        for tenant, deadline in requests:
+            tasks.append(asyncio.create_task(request(tenant, deadline)))
+            await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    return order
+
+
+def later(seconds=10):
+    return time.monotonic() + seconds
+
+
+def test_quiet_tenant_is_not_stuck_behind_busy_one():
+    order = run_order(FairScheduler(concurrency=1), [("busy", later())] * 5 + [("quiet", later())])
+    assert order.index("quiet") <= 1
+
+
+def test_weights_share_slots_proportionally():
+    scheduler = FairScheduler(concurrency=1, weights={"a": 2})
+    order = run_order(scheduler, [("a", later())] * 6 + [("b", later())] * 6)
+    assert order[:6].count("a") == 4
+
+
+def test_request_near_deadline_goes_first():
+    order = run_order(FairScheduler(concurrency=1), [("a", later()), ("b", later()), ("c", later(0.1))])
+    assert order[0] == "c"
+
+
+def test_cancelled_waiter_leaves_queue():
+    scheduler = FairScheduler(concurrency=1)
+
+    async def run():
+        async with scheduler.slot("a"):
+            waiter = asyncio.create_task(scheduler.slot("b").__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+        async with scheduler.slot("c"):
+            pass
+
+    asyncio.run(run())
+    assert scheduler.active == 0
+    assert scheduler._waiting == []
+
+
+def test_queue_time_metrics_label_only_configured_tenants():
+    metrics.reset()
+    run_order(FairScheduler(concurrency=1, weights={"a": 1}), [("a", later()), ("kiosk-123", later())])
+    timings = metrics.snapshot()["timings"]
+    assert "scheduler_queue_seconds{tenant=a}" in timings
+    assert "scheduler_queue_seconds{tenant=other}" in timings
+    assert not any("kiosk-123" in key for key in timings)
+
+
+def test_tenant_for():
+    assert tenant_for("gangnam:kiosk-3") == "gangnam"
+    assert tenant_for("gangnam:kiosk-3", "hongdae") == "hongdae"
+    # 매장을 알 수 없으면 세션 단위가 아니라 기본 테넌트로
+    assert tenant_for("kiosk-3") == "default"
+    assert tenant_for(":kiosk-3") == "default"
+    assert tenant_for("") == "default"
+
+
+def test_full_queue_rejects_instead_of_waiting():
+    scheduler = FairScheduler(concurrency=1, max_waiting=1)
+
+    async def run():
+        async with scheduler.slot("a"):
+            waiter = asyncio.create_task(scheduler.slot("b").__aenter__())
+            await asyncio.sleep(0)
+            with pytest.raises(SchedulerFull):
+                async with scheduler.slot("c"):
+                    pass
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+
+    asyncio.run(run())
+    assert scheduler._waiting == []
+
+
+def test_light_tenant_overtakes_backlog_under_overload():
+    # 과부하로 대기자 모두가 마감 임박이어도 도착 순서(FIFO)가 아니라 공정 순서
+    requests = [("busy", later(0.5))] * 20 + [("quiet", later(0.5))]
+    order = run_order(FairScheduler(concurrency=1), requests)
+    assert order.index("quiet") <= 1
+
+
+def test_tracked_tenants_are_capped(monkeypatch):
+    monkeypatch.setattr("app.services.scheduler.MAX_TRACKED_TENANTS", 100)
+    scheduler = FairScheduler(concurrency=1)
+    for index in range(1000):
+        scheduler._tag(f"store-{index}")
+    assert len(scheduler._finish) == 100
+    assert "store-999" in scheduler._finish
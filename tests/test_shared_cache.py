@@ -0,0 +1,96 @@
+import multiprocessing
+
+import pytest
+
+from app.services.intent_cache import IntentCache
+from app.services.shared_cache import SharedTable
+
+
+def make_table(tmp_path, slots=64, slot_bytes=256, ways=4):
+    return SharedTable(str(tmp_path / "cache.shm"), slots, slot_bytes, ways)
+
+
+def test_put_get_and_overwrite(tmp_path):
+    table = make_table(tmp_path)
+    assert table.get("k") is None
+    assert table.put("k", '{"intents": ["help"]}')
+    assert table.get("k") == '{"intents": ["help"]}'
+    table.put("k", '{"intents": ["exit"]}')
+    assert table.get("k") == '{"intents": ["exit"]}'
+    table.close()
+
+
+def test_oversize_value_is_skipped(tmp_path):
+    table = make_table(tmp_path, slot_bytes=64)
+    assert not table.put("k", "가" * 100)
+    assert table.get("k") is None
+    table.close()
+
+
+def test_full_set_replaces_oldest(tmp_path):
+    # set 이 하나뿐이면 모든 키가 같은 set 에 들어감
+    table = make_table(tmp_path, slots=2, ways=2)
+    table.put("a", "1")
+    table.put("b", "2")
+    table.put("c", "3")
+    assert table.get("a") is None
+    assert table.get("b") == "2" and table.get("c") == "3"
+    table.close()
+
+
+def test_other_geometry_uses_its_own_file(tmp_path):
+    table = make_table(tmp_path)
+    table.put("k", "v")
+
+    same = make_table(tmp_path)
+    assert same.get("k") == "v"
+    same.close()
+
+    # 설정이 다른 워커가 열어도 기존 파일은 그대로 (mmap 중인 워커가 깨지지 않음)
+    resized = make_table(tmp_path, slots=128)
+    assert resized.path != table.path
+    assert resized.get("k") is None
+    assert table.get("k") == "v"
+    resized.close()
+    table.close()
+
+
+def test_corrupt_file_is_refused(tmp_path):
+    table = make_table(tmp_path)
+    path = table.path
+    table.close()
+    with open(path, "r+b") as f:
+        f.write(b"XXXXXXXX")
+    with pytest.raises(ValueError):
+        make_table(tmp_path)
+
+
+def _write(path):
+    table = SharedTable(path, 64, 256, 4)
+    table.put("from-child", '{"intents": ["recommend"]}')
+    table.close()
+
+
+def test_visible_across_processes(tmp_path):
+    path = str(tmp_path / "cache.shm")
+    table = SharedTable(path, 64, 256, 4)
+    process = multiprocessing.get_context("spawn").Process(target=_write, args=(path,))
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+    assert table.get("from-child") == '{"intents": ["recommend"]}'
+    table.close()
+
+
+def test_intent_cache_reads_shared_tier_before_disk(tmp_path):
+    shared_path = str(tmp_path / "cache.shm")
+    writer = IntentCache(str(tmp_path / "a.sqlite3"), 100, 10, flush_interval=0.01,
+                         shared=SharedTable(shared_path, 64, 256, 4))
+    reader = IntentCache(str(tmp_path / "b.sqlite3"), 100, 10, flush_interval=0.01,
+                         shared=SharedTable(shared_path, 64, 256, 4))
+    writer.put("k", {"intents": ["help"], "filters": {}})
+    # 다른 워커(다른 SQLite)에서도 공유 계층으로 바로 보임
+    assert reader.get("k") == {"intents": ["help"], "filters": {}}
+    assert reader.shared_hits == 1
+    writer.close()
+    reader.close()
@@ -0,0 +1,71 @@
+import asyncio
+
+from app.services import metrics, runtime_config, slot_parser
+from app.services.intent_eval import BACKENDS, evaluate, load_corpus
+from app.services.runtime_config import ConfigSnapshot
+
+
+def options(text, **kwargs):
+    result = slot_parser.parse_slots(text, **kwargs)
+    return result and result["items"][0]["options"]
+
+
+def test_bare_option_answers():
+    assert options("M") == {"size": "M"}
+    assert options("라지로요") == {"size": "L"}
+    assert options("엠 사이즈요") == {"size": "M"}
+    assert options("L, 아이스요") == {"size": "L", "temperature": "아이스"}
+    assert options("따뜻하게 해주세요") == {"temperature": "핫"}
+    assert options("한 샷 추가") == {"shot": "진하게"}
+
+
+def test_short_replies():
+    assert slot_parser.parse_slots("아니요") == {"intents": None, "action": "reject"}
+    assert slot_parser.parse_slots("네") == {"intents": None, "action": "accept"}
+    assert slot_parser.parse_slots("아이스 좋아") is None
+
+
+def test_anything_unknown_goes_to_the_model():
+    assert options("아메리카노 M") is None
+    # "M을"은 기존 항목을 가리키는 조건 (from/to 구조)
+    assert options("M을 L로 바꿔줘") is None
+    # 음료/커피에 따라 필드가 달라지는 표현
+    assert options("샷 두 개 추가") is None
+    assert options("M L") is None
+
+
+def test_page_grammar_and_coverage():
+    metrics.reset()
+    config = ConfigSnapshot({"slot_pages": {"size": ["size"], "main": [], "*": []}}, "")
+    assert slot_parser.parse("M", "size", config) is not None
+    assert slot_parser.parse("아이스", "size", config) is None
+    assert slot_parser.parse("M", "main", config) is None
+    gauges = metrics.snapshot()["gauges"]
+    assert gauges["slot_parser_coverage{page=size}"] == 0.5
+    assert gauges["slot_parser_coverage{page=main}"] == 0.0
+
+
+def test_unregistered_pages_share_one_label():
+    metrics.reset()
+    config = ConfigSnapshot({"slot_pages": {"size": ["size"], "*": []}}, "")
+    for index in range(50):
+        slot_parser.parse("M", f"kiosk-{index}", config)
+    gauges = metrics.snapshot()["gauges"]
+    assert "slot_parser_coverage{page=other}" in gauges
+    assert not any("kiosk-" in key for key in gauges)
+
+
+def test_shipped_settings_only_parse_on_option_pages():
+    config = runtime_config.ConfigStore().current
+    assert slot_parser.parse("M", "option", config) == {"intents": ["order.update"], "items": [{"options": {"size": "M"}}], "filters": {}}
+    assert slot_parser.parse("네", "payment", config) == {"intents": None, "action": "accept"}
+    for text in ("네", "보통", "기본", "M"):
+        assert slot_parser.parse(text, "main", config) is None
+        assert slot_parser.parse(text, "", config) is None
+    assert slot_parser.parse("M", "main", ConfigSnapshot({}, "")) is None
+
+
+def test_handled_corpus_cases_are_exact():
+    report = asyncio.run(evaluate(BACKENDS["slot"](), load_corpus()))
+    assert report["summary"]["handled"] >= 8
+    assert report["summary"]["exact_accuracy"] == 1.0
@@ -0,0 +1,68 @@
+from app.services import templates
+from app.services.runtime_config import ConfigSnapshot
+
+HELP = {"intents": ["help"], "filters": {}}
+
+
+def config(version="1"):
+    return ConfigSnapshot({"template_version": version}, "")
+
+
+def test_template_key_only_for_fixed_intents_without_content():
+    assert templates.template_key(HELP, "main") == "help|main"
+    assert templates.template_key({"intents": ["error"], "filters": {}, "items": []}, "") == "error|"
+    assert templates.template_key({"intents": ["help", "order.pay"]}, "main") is None
+    assert templates.template_key({"intents": ["confirm"], "target": "menu"}, "main") is None
+    assert templates.template_key({"intents": ["help"], "categories": ["커피"]}, "main") is None
+    # exit 는 TEMPLATE_INTENTS 에 넣었을 때만
+    assert templates.template_key({"intents": ["exit"], "filters": {}}, "main") is None
+
+
+def test_store_is_versioned_and_returns_copies():
+    store = templates.TemplateStore()
+    assert store.get("help|main", config()) is None
+    store.put("help|main", config(), {"message": "도움말", "actions": []})
+
+    template = store.get("help|main", config())
+    assert template == {"message": "도움말", "actions": []}
+    template["actions"].append("changed")
+    assert store.get("help|main", config())["actions"] == []
+
+    assert store.get("help|main", config("2")) is None
+    assert store.get("help|order", config()) is None
+
+
+def test_failed_or_queued_responses_are_not_stored():
+    store = templates.TemplateStore()
+    store.put("help|main", config(), {"status": "accepted"})
+    store.put("help|main", config(), {"error": "timeout"})
+    store.put("help|main", config(), None)
+    assert store.entries() == {}
+
+
+def test_purge():
+    store = templates.TemplateStore()
+    store.put("help|main", config(), {"message": "도움말"})
+    assert store.entries() == {"help|main": "1"}
+    assert store.purge() == 1
+    assert store.get("help|main", config()) is None
+
+
+def test_exit_is_delivered_in_background():
+    assert templates.needs_delivery({"intents": ["exit"]})
+    assert not templates.needs_delivery(HELP)
+
+
+def test_store_byte_cap_rejects_new_templates():
+    response = {"message": "도움말" * 100}
+    store = templates.TemplateStore()
+    store.put("help|main", config(), response)
+    one = store.bytes_used
+    store = templates.TemplateStore(max_bytes=one + 10)
+    store.put("help|main", config(), response)
+    store.put("help|order", config(), response)
+    assert list(store.entries()) == ["help|main"]
+    # 같은 키를 새 버전으로 덮어쓰는 것은 허용
+    store.put("help|main", config("2"), response)
+    assert store.entries() == {"help|main": "2"}
+    assert store.bytes_used == one
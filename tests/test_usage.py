@@ -0,0 +1,94 @@
+import threading
+
+from app.services import metrics, usage
+from app.services.usage import UsageTracker, day_tokens, read_log, summarize, usage_tokens
+
+
+def test_usage_tokens_reads_cached_details():
+    usage = {"prompt_tokens": 1200, "completion_tokens": 40, "prompt_tokens_details": {"cached_tokens": 1024}}
+    assert usage_tokens(usage) == {"prompt_tokens": 1200, "completion_tokens": 40, "cached_tokens": 1024}
+    assert usage_tokens(None)["prompt_tokens"] == 0
+
+
+def test_budget_survives_restart(tmp_path):
+    path = str(tmp_path / "usage.jsonl")
+    tracker = UsageTracker(path, daily_budget=2000)
+    tracker.record("main", ["order.add"], "gpt-4o-mini", {"prompt_tokens": 1500, "completion_tokens": 0, "cached_tokens": 0}, 0.5)
+    assert not tracker.over_budget()
+    tracker.record("menu", ["recommend"], "gpt-4o-mini", {"prompt_tokens": 500, "completion_tokens": 20, "cached_tokens": 0}, 0.7)
+    tracker.close()
+
+    restarted = UsageTracker(path, daily_budget=2000)
+    # 오늘 사용량은 쓰기 스레드에서 읽으므로 첫 확인은 루프를 막지 않고 바로 반환
+    restarted.over_budget()
+    restarted.flush()
+    assert restarted.over_budget()
+    assert len(read_log(path)) == 2
+
+
+def test_truncated_line_is_skipped(tmp_path):
+    path = tmp_path / "usage.jsonl"
+    path.write_text('{"day": "2026-01-01", "prompt_tokens": 10, "completion_tokens": 1}\n{"day": "2026-', encoding="utf-8")
+    assert len(read_log(str(path))) == 1
+
+    tracker = UsageTracker(str(path), daily_budget=100)
+    tracker.record("main", ["help"], "gpt-4o-mini", {"prompt_tokens": 5, "completion_tokens": 0, "cached_tokens": 0}, 0.1)
+    tracker.flush()
+    assert not tracker.over_budget()
+    tracker.close()
+
+
+def test_day_tokens_reads_only_the_tail(tmp_path, monkeypatch):
+    monkeypatch.setattr(usage, "TAIL_BLOCK_BYTES", 16)
+    path = tmp_path / "usage.jsonl"
+    lines = ['{"day": "2026-01-01", "prompt_tokens": 1000, "completion_tokens": 0}'] * 3
+    lines += ['{"day": "2026-01-02", "prompt_tokens": 7, "completion_tokens": 3}', "not json"]
+    lines += ['{"day": "2026-01-02", "prompt_tokens": 20, "completion_tokens": 0}']
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    assert day_tokens(str(path), "2026-01-02") == 30
+    assert day_tokens(str(path), "2026-01-03") == 0
+
+
+def test_summarize_by_page_and_intent():
+    entries = [
+        {"page": "main", "intents": ["order.add", "order.pay"], "prompt_tokens": 100, "completion_tokens": 10,
+         "cached_tokens": 0, "latency_ms": 100.0},
+        {"page": "main", "intents": [], "prompt_tokens": 300, "completion_tokens": 10,
+         "cached_tokens": 0, "latency_ms": 300.0},
+    ]
+    by_page = summarize(entries, "page")
+    assert by_page["main"]["requests"] == 2
+    assert by_page["main"]["prompt_tokens"] == 400
+    assert round(by_page["main"]["tokens_latency_corr"], 2) == 1.0
+
+    by_intent = summarize(entries, "intent")
+    assert set(by_intent) == {"order.add", "order.pay", "none"}
+
+
+
+def test_metrics_use_bounded_page_label(tmp_path):
+    metrics.reset()
+    tracker = UsageTracker(str(tmp_path / "usage.jsonl"))
+    tokens = {"prompt_tokens": 10, "completion_tokens": 1, "cached_tokens": 0}
+    tracker.record("kiosk-page-123", ["help"], "gpt-4o-mini", tokens, 0.1)
+    tracker.record("option", ["help"], "gpt-4o-mini", tokens, 0.1, label="option")
+    tracker.close()
+    counters = metrics.snapshot()["counters"]
+    assert counters["openai_prompt_tokens{intent=help,page=other}"] == 10
+    assert counters["openai_prompt_tokens{intent=help,page=option}"] == 10
+    assert not any("kiosk-page-123" in key for key in counters)
+    # 로그에는 원래 page 를 남김
+    assert read_log(tracker.path)[0]["page"] == "kiosk-page-123"
+
+
+def test_full_write_queue_drops_instead_of_blocking(tmp_path):
+    metrics.reset()
+    tracker = UsageTracker(str(tmp_path / "usage.jsonl"), daily_budget=100, queue_max=1)
+    # 쓰기 스레드가 멈춘 상황: 큐를 비우는 쪽이 없음
+    tracker._writer = threading.current_thread()
+    tokens = {"prompt_tokens": 60, "completion_tokens": 0, "cached_tokens": 0}
+    tracker.record("main", ["help"], "gpt-4o-mini", tokens, 0.1)
+    tracker.record("main", ["help"], "gpt-4o-mini", tokens, 0.1)
+    assert metrics.snapshot()["counters"]["usage_log_dropped"] == 2
+    # 로그는 버려도 예산은 메모리에서 누적
+    assert tracker.over_budget()
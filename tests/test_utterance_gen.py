@@ -0,0 +1,64 @@
+from collections import Counter
+
+from app.services import slot_parser
+from app.services.intent_eval import compare
+from app.services.utterance_gen import DEFAULT_MENU, UtteranceGenerator, josa, summarize
+
+INTENTS = {"recommend", "order.add", "order.update", "order.delete", "order.pay", "confirm"}
+NAMES = {item["name"] for item in DEFAULT_MENU}
+
+
+def test_josa_follows_final_consonant():
+    assert josa("카페라떼", "을", "를") == "카페라떼를"
+    assert josa("치즈케이크", "을", "를") == "치즈케이크를"
+    assert josa("마카롱", "을", "를") == "마카롱을"
+    assert josa("마카롱", "으로", "로") == "마카롱으로"
+    assert josa("베이글", "으로", "로") == "베이글로"
+    assert josa("M", "으로", "로") == "M으로"
+
+
+def test_same_seed_same_traffic():
+    first = list(UtteranceGenerator(seed=3).traffic(200, 100))
+    second = list(UtteranceGenerator(seed=3).traffic(200, 100))
+    assert first == second
+
+
+def test_records_follow_prompt_grammar():
+    for record in UtteranceGenerator(seed=1).pool(400):
+        expected = record["expected"]
+        assert set(expected["intents"]) <= INTENTS, record
+        assert "filters" in expected
+        for item in expected.get("items", []):
+            assert "count" not in item
+            assert item.get("name", next(iter(NAMES))) in NAMES
+        if "recommend" in expected["intents"]:
+            assert expected["categories"]
+        if "confirm" in expected["intents"]:
+            assert expected["target"] in ("cart", "order", "price", "menu")
+
+
+def test_quantity_repeats_items():
+    records = UtteranceGenerator(seed=2, mix={"order": 1}).pool(200)
+    assert any("세 " in record["text"] and len(record["expected"]["items"]) == 3 for record in records)
+
+
+def test_zipf_controls_repetition():
+    skewed = summarize(list(UtteranceGenerator(seed=0).traffic(5000, 500, zipf=1.5)))
+    flat = summarize(list(UtteranceGenerator(seed=0).traffic(5000, 500, zipf=0)))
+    assert skewed["top10_share"] > flat["top10_share"] * 3
+    assert skewed["cache_hit_ceiling"] > flat["cache_hit_ceiling"]
+
+
+def test_mix_weights_are_respected():
+    kinds = Counter(record["kind"] for record in UtteranceGenerator(seed=0).traffic(4000, 400))
+    assert 0.35 < kinds["order"] / 4000 < 0.45
+    assert 0.15 < kinds["confirm"] / 4000 < 0.25
+
+
+def test_bare_options_match_slot_parser():
+    # 옵션 단답은 로컬 문법이 처리하고 기대값과 같아야 함
+    records = [r for r in UtteranceGenerator(seed=4, mix={"change": 1}).pool(300) if r["page"] == "option"]
+    assert records
+    for record in records:
+        parsed = slot_parser.parse_slots(record["text"])
+        assert parsed is not None and all(compare(record["expected"], parsed).values()), record["text"]
@@ -0,0 +1,45 @@
+import asyncio
+
+from app.services.voice_stream import VoiceStreamSession
+
+
+def make_session(calls, delay=0.01):
+    async def extract(text, page):
+        calls.append(("extract", text))
+        await asyncio.sleep(delay)
+        calls.append(("done", text))
+        return {"intents": ["order.add"], "text": text}
+
+    async def dispatch(intent_result, session_id, page):
+        return {"session": session_id, "page": page, "text": intent_result["text"]}
+
+    return VoiceStreamSession("s1", extract, dispatch)
+
+
+def test_final_reuses_matching_speculation():
+    calls = []
+
+    async def run():
+        session = make_session(calls)
+        assert await session.handle({"type": "partial", "text": "아메리카노"}) is None
+        await session.handle({"type": "partial", "text": "아메리카노  하나"})
+        await asyncio.sleep(0)
+        return await session.handle({"type": "final", "text": "아메리카노 하나", "page": "main"})
+
+    assert asyncio.run(run()) == {"session": "s1", "page": "main", "text": "아메리카노 1개"}
+    # 첫 번째 추측은 텍스트가 바뀌면서 취소되고, 최종 발화는 두 번째 추측 결과를 재사용
+    assert calls == [("extract", "아메리카노 1개"), ("done", "아메리카노 1개")]
+
+
+def test_changed_final_cancels_speculation():
+    calls = []
+
+    async def run():
+        session = make_session(calls)
+        session.partial("카페라떼")
+        await asyncio.sleep(0)
+        return await session.final("카페라떼 말고 아메리카노")
+
+    assert asyncio.run(run())["text"] == "카페라떼 말고 아메리카노"
+    assert ("done", "카페라떼") not in calls
+    assert calls[-1] == ("done", "카페라떼 말고 아메리카노")